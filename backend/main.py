@@ -1,24 +1,33 @@
 from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, configure_mappers, contains_eager, joinedload, load_only, raiseload, selectinload, undefer
 from datetime import datetime, timedelta, timezone, date
 from datetime import time as time_type
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 from decimal import Decimal
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+import csv
+import io
+import orjson
 import os
 import secrets
+import anyio
+from dataclasses import dataclass
 import models
 import schemas
-from database import engine, get_db
-from sqlalchemy import inspect, text, bindparam, func, literal, or_
+from database import SessionLocal, engine, get_db
+from schemas import ZERO
+from sqlalchemy import Float, Numeric, inspect, text, bindparam, func, insert, or_, select, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from passlib.context import CryptContext
 import jwt
 
+# Resolve all relationships once at import instead of on the first query
+configure_mappers()
+
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
 
@@ -33,7 +42,7 @@ def ensure_shop_columns():
     if "manager_name" not in columns:
         statements.append("ALTER TABLE shops ADD COLUMN IF NOT EXISTS manager_name VARCHAR")
     if "debt" not in columns:
-        statements.append("ALTER TABLE shops ADD COLUMN IF NOT EXISTS debt FLOAT DEFAULT 0")
+        statements.append("ALTER TABLE shops ADD COLUMN IF NOT EXISTS debt NUMERIC(14, 2) DEFAULT 0")
 
     if statements:
         with engine.begin() as connection:
@@ -280,7 +289,7 @@ def ensure_counterparty_sales_tables():
             phone VARCHAR,
             iin_bin VARCHAR,
             address VARCHAR,
-            debt FLOAT NOT NULL DEFAULT 0,
+            debt NUMERIC(14, 2) NOT NULL DEFAULT 0,
             created_at TIMESTAMP DEFAULT NOW(),
             created_by_admin_id INTEGER NOT NULL REFERENCES users(id),
             is_archived BOOLEAN DEFAULT FALSE
@@ -294,9 +303,9 @@ def ensure_counterparty_sales_tables():
             created_at TIMESTAMP DEFAULT NOW(),
             closed_at TIMESTAMP,
             created_by_admin_id INTEGER NOT NULL REFERENCES users(id),
-            total_amount FLOAT DEFAULT 0,
-            paid_amount FLOAT DEFAULT 0,
-            debt_amount FLOAT DEFAULT 0
+            total_amount NUMERIC(14, 2) DEFAULT 0,
+            paid_amount NUMERIC(14, 2) DEFAULT 0,
+            debt_amount NUMERIC(14, 2) DEFAULT 0
         )
     """
     create_sales_order_items = """
@@ -305,16 +314,16 @@ def ensure_counterparty_sales_tables():
             sales_order_id INTEGER REFERENCES sales_orders(id) ON DELETE CASCADE,
             product_id INTEGER REFERENCES products(id),
             quantity FLOAT NOT NULL,
-            price_at_time FLOAT NOT NULL,
-            line_total FLOAT NOT NULL
+            price_at_time NUMERIC(14, 2) NOT NULL,
+            line_total NUMERIC(14, 2) NOT NULL
         )
     """
     create_sales_order_payments = """
         CREATE TABLE IF NOT EXISTS sales_order_payments (
             id SERIAL PRIMARY KEY,
             sales_order_id INTEGER REFERENCES sales_orders(id) ON DELETE CASCADE,
-            paid_amount FLOAT NOT NULL,
-            debt_amount FLOAT NOT NULL,
+            paid_amount NUMERIC(14, 2) NOT NULL,
+            debt_amount NUMERIC(14, 2) NOT NULL,
             created_at TIMESTAMP DEFAULT NOW()
         )
     """
@@ -350,7 +359,7 @@ def ensure_counterparty_columns():
 
     statements = []
     if "debt" not in columns:
-        statements.append("ALTER TABLE counterparties ADD COLUMN IF NOT EXISTS debt FLOAT DEFAULT 0")
+        statements.append("ALTER TABLE counterparties ADD COLUMN IF NOT EXISTS debt NUMERIC(14, 2) DEFAULT 0")
 
     if statements:
         with engine.begin() as connection:
@@ -368,7 +377,7 @@ def ensure_counterparty_trade_tables():
         company_name VARCHAR,
         phone VARCHAR,
         address VARCHAR,
-        debt FLOAT NOT NULL DEFAULT 0,
+        debt NUMERIC(14, 2) NOT NULL DEFAULT 0,
         created_at TIMESTAMP DEFAULT NOW(),
         created_by_admin_id INTEGER NOT NULL REFERENCES users(id),
         is_archived BOOLEAN DEFAULT FALSE
@@ -379,14 +388,14 @@ def ensure_counterparty_trade_tables():
         created_by_admin_id INTEGER NOT NULL REFERENCES users(id),
         driver_id INTEGER NULL REFERENCES users(id),
         created_at TIMESTAMP DEFAULT NOW(),
-        total_amount FLOAT NOT NULL DEFAULT 0,
-        paid_kaspi FLOAT NOT NULL DEFAULT 0,
-        paid_cash FLOAT NOT NULL DEFAULT 0,
-        paid_debt FLOAT NOT NULL DEFAULT 0,
-        paid_total FLOAT NOT NULL DEFAULT 0,
-        new_debt_added FLOAT NOT NULL DEFAULT 0,
-        old_debt FLOAT NOT NULL DEFAULT 0,
-        debt_after FLOAT NOT NULL DEFAULT 0,
+        total_amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        paid_kaspi NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        paid_cash NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        paid_debt NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        paid_total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        new_debt_added NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        old_debt NUMERIC(14, 2) NOT NULL DEFAULT 0,
+        debt_after NUMERIC(14, 2) NOT NULL DEFAULT 0,
         note VARCHAR
     );
     CREATE TABLE IF NOT EXISTS counterparty_sale_items (
@@ -394,18 +403,18 @@ def ensure_counterparty_trade_tables():
         sale_id INTEGER REFERENCES counterparty_sales(id) ON DELETE CASCADE,
         product_id INTEGER REFERENCES products(id),
         quantity FLOAT NOT NULL,
-        price_at_time FLOAT NOT NULL,
-        line_total FLOAT NOT NULL
+        price_at_time NUMERIC(14, 2) NOT NULL,
+        line_total NUMERIC(14, 2) NOT NULL
     );
     CREATE TABLE IF NOT EXISTS counterparty_debt_payments (
         id SERIAL PRIMARY KEY,
         counterparty_id INTEGER REFERENCES counterparties(id),
-        amount FLOAT NOT NULL,
+        amount NUMERIC(14, 2) NOT NULL,
         pay_method VARCHAR NOT NULL,
         created_at TIMESTAMP DEFAULT NOW(),
         created_by_admin_id INTEGER REFERENCES users(id),
-        debt_before FLOAT NOT NULL,
-        debt_after FLOAT NOT NULL,
+        debt_before NUMERIC(14, 2) NOT NULL,
+        debt_after NUMERIC(14, 2) NOT NULL,
         comment VARCHAR
     );
     """
@@ -416,14 +425,14 @@ def ensure_counterparty_trade_tables():
             created_by_admin_id INTEGER NOT NULL REFERENCES users(id),
             driver_id INTEGER NULL REFERENCES users(id),
             created_at TIMESTAMP DEFAULT NOW(),
-            total_amount FLOAT NOT NULL DEFAULT 0,
-            paid_kaspi FLOAT NOT NULL DEFAULT 0,
-            paid_cash FLOAT NOT NULL DEFAULT 0,
-            paid_debt FLOAT NOT NULL DEFAULT 0,
-            paid_total FLOAT NOT NULL DEFAULT 0,
-            new_debt_added FLOAT NOT NULL DEFAULT 0,
-            old_debt FLOAT NOT NULL DEFAULT 0,
-            debt_after FLOAT NOT NULL DEFAULT 0,
+            total_amount NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            paid_kaspi NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            paid_cash NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            paid_debt NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            paid_total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            new_debt_added NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            old_debt NUMERIC(14, 2) NOT NULL DEFAULT 0,
+            debt_after NUMERIC(14, 2) NOT NULL DEFAULT 0,
             note VARCHAR
         )
     """
@@ -433,20 +442,20 @@ def ensure_counterparty_trade_tables():
             sale_id INTEGER REFERENCES counterparty_sales(id) ON DELETE CASCADE,
             product_id INTEGER REFERENCES products(id),
             quantity FLOAT NOT NULL,
-            price_at_time FLOAT NOT NULL,
-            line_total FLOAT NOT NULL
+            price_at_time NUMERIC(14, 2) NOT NULL,
+            line_total NUMERIC(14, 2) NOT NULL
         )
     """
     create_debt_payments = """
         CREATE TABLE IF NOT EXISTS counterparty_debt_payments (
             id SERIAL PRIMARY KEY,
             counterparty_id INTEGER REFERENCES counterparties(id),
-            amount FLOAT NOT NULL,
+            amount NUMERIC(14, 2) NOT NULL,
             pay_method VARCHAR NOT NULL,
             created_at TIMESTAMP DEFAULT NOW(),
             created_by_admin_id INTEGER REFERENCES users(id),
-            debt_before FLOAT NOT NULL,
-            debt_after FLOAT NOT NULL,
+            debt_before NUMERIC(14, 2) NOT NULL,
+            debt_after NUMERIC(14, 2) NOT NULL,
             comment VARCHAR
         )
     """
@@ -480,7 +489,210 @@ def ensure_counterparty_sales_driver_column():
 
 ensure_counterparty_sales_driver_column()
 
-app = FastAPI(title="Confectionery Management System")
+
+SNAPSHOT_BACKFILLS = {
+    "product_name": (
+        "UPDATE {table} AS t SET product_name = p.name "
+        "FROM products p WHERE p.id = t.product_id AND t.product_name IS NULL"
+    ),
+    "manager_name": (
+        "UPDATE {table} AS t SET manager_name = COALESCE(u.full_name, u.username) "
+        "FROM users u WHERE u.id = t.manager_id AND t.manager_name IS NULL"
+    ),
+    "shop_name": (
+        "UPDATE {table} AS t SET shop_name = s.name "
+        "FROM shops s WHERE s.id = t.shop_id AND t.shop_name IS NULL"
+    ),
+}
+
+
+def ensure_snapshot_columns():
+    # Names are copied onto documents when they are created so history does not change with renames
+    snapshot_columns = {
+        "dispatches": ["manager_name"],
+        "dispatch_items": ["product_name"],
+        "incoming_items": ["product_name"],
+        "shop_orders": ["manager_name", "shop_name"],
+        "shop_order_items": ["product_name"],
+        "shop_returns": ["manager_name", "shop_name"],
+        "shop_return_items": ["product_name"],
+        "manager_returns": ["manager_name"],
+        "manager_return_items": ["product_name"],
+    }
+
+    inspector = inspect(engine)
+    for table, names in snapshot_columns.items():
+        try:
+            columns = {column["name"] for column in inspector.get_columns(table)}
+        except Exception:
+            continue
+
+        missing = [name for name in names if name not in columns]
+        if not missing:
+            continue
+
+        with engine.begin() as connection:
+            for name in missing:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {name} VARCHAR"))
+                connection.execute(text(SNAPSHOT_BACKFILLS[name].format(table=table)))
+
+
+ensure_snapshot_columns()
+
+# Tables created outside the ORM metadata that also hold money
+RAW_MONEY_COLUMNS = {"dispatch_items": ["price"]}
+
+
+def ensure_money_columns():
+    # Older databases stored money as FLOAT; convert to exact NUMERIC(14, 2) in place
+    if engine.dialect.name != "postgresql":
+        return
+
+    money_columns: Dict[str, List[str]] = {table: list(names) for table, names in RAW_MONEY_COLUMNS.items()}
+    for table in models.Base.metadata.sorted_tables:
+        for column in table.columns:
+            column_type = column.type
+            if isinstance(column_type, Numeric) and not isinstance(column_type, Float) and column_type.scale == 2:
+                money_columns.setdefault(table.name, []).append(column.name)
+
+    inspector = inspect(engine)
+    for table, names in money_columns.items():
+        try:
+            existing = {column["name"]: column["type"] for column in inspector.get_columns(table)}
+        except Exception:
+            continue
+
+        pending = [
+            name
+            for name in names
+            if name in existing
+            and (isinstance(existing[name], Float) or getattr(existing[name], "scale", None) != 2)
+        ]
+        if not pending:
+            continue
+
+        with engine.begin() as connection:
+            for name in pending:
+                connection.execute(
+                    text(
+                        f"ALTER TABLE {table} ALTER COLUMN {name} "
+                        f"TYPE NUMERIC(14, 2) USING ROUND({name}::numeric, 2)"
+                    )
+                )
+
+
+ensure_money_columns()
+
+
+def ensure_column_defaults():
+    # Timestamps are filled by the database now; older tables were created without a server default
+    if engine.dialect.name != "postgresql":
+        return
+
+    inspector = inspect(engine)
+    for table in models.Base.metadata.sorted_tables:
+        server_defaults = {
+            column.name: column.server_default.arg
+            for column in table.columns
+            if column.server_default is not None and not column.primary_key
+        }
+        if not server_defaults:
+            continue
+
+        try:
+            existing = {column["name"]: column.get("default") for column in inspector.get_columns(table.name)}
+        except Exception:
+            continue
+
+        pending = [name for name in server_defaults if name in existing and existing[name] is None]
+        if not pending:
+            continue
+
+        with engine.begin() as connection:
+            for name in pending:
+                default_sql = server_defaults[name].compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ALTER COLUMN {name} SET DEFAULT {default_sql}"))
+
+
+ensure_column_defaults()
+
+
+def ensure_shop_order_items_cache():
+    inspector = inspect(engine)
+    try:
+        columns = {column["name"] for column in inspector.get_columns("shop_orders")}
+    except Exception:
+        return
+
+    if "items_cache" in columns:
+        return
+
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE shop_orders ADD COLUMN IF NOT EXISTS items_cache JSONB"))
+        connection.execute(
+            text(
+                """
+                UPDATE shop_orders AS o
+                SET items_cache = c.items
+                FROM (
+                    SELECT order_id,
+                           jsonb_agg(
+                               jsonb_build_object(
+                                   'product_id', product_id,
+                                   'product_name', COALESCE(product_name, ''),
+                                   'quantity', quantity,
+                                   'price', price,
+                                   'is_bonus', COALESCE(is_bonus, FALSE),
+                                   'is_return', COALESCE(is_return, FALSE)
+                               )
+                               ORDER BY id
+                           ) AS items
+                    FROM shop_order_items
+                    GROUP BY order_id
+                ) AS c
+                WHERE c.order_id = o.id AND o.items_cache IS NULL
+                """
+            )
+        )
+
+
+ensure_shop_order_items_cache()
+
+
+def ensure_product_search_index():
+    if engine.dialect.name != "postgresql":
+        return
+
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_products_name_trgm "
+                    "ON products USING gin (name gin_trgm_ops)"
+                )
+            )
+    except Exception:
+        # pg_trgm may be unavailable without superuser rights; search still works without the index
+        return
+
+
+ensure_product_search_index()
+
+
+def ensure_indexes():
+    # create_all() only builds indexes for new tables; add ones declared later on existing tables
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except SQLAlchemyError:
+                continue
+
+
+ensure_indexes()
+
+app = FastAPI(title="Confectionery Management System", default_response_class=ORJSONResponse)
 
 ALLOWED_ORIGINS = [
     "http://localhost:8080",
@@ -499,6 +711,12 @@ app.add_middleware(
 )
 
 
+class ErrorJSONResponse(ORJSONResponse):
+    # Validation errors carry Decimal constraints and arbitrary inputs; anything orjson cannot encode is written as str
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     parts = []
@@ -507,15 +725,18 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         msg = error.get("msg", "validation error")
         parts.append(f"{loc}: {msg}")
 
-    return JSONResponse(
+    return ErrorJSONResponse(
         status_code=422,
         content={"detail": "; ".join(parts), "errors": exc.errors()},
     )
 
 # Security
 SECRET_KEY = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
+SECRET_KEY_BYTES = SECRET_KEY.encode()
 ALGORITHM = "HS256"
+JWT_DECODE_OPTIONS = {"verify_aud": False, "verify_iss": False}
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "64"))
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -543,9 +764,17 @@ def _to_decimal(value: Any) -> Decimal:
     if isinstance(value, Decimal):
         return value
     if value is None:
-        return Decimal("0")
+        return ZERO
     return Decimal(str(value))
 
+
+def _whole_quantity(value: Any) -> int:
+    # Stock columns count whole units, so fractional quantities are rejected instead of truncated
+    quantity = _to_decimal(value)
+    if quantity != quantity.to_integral_value():
+        raise HTTPException(status_code=400, detail="Количество должно быть целым числом")
+    return int(quantity)
+
 # Helper functions
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -557,54 +786,109 @@ def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+@dataclass
+class AuthedUser:
+    id: int
+    username: str
+    role: str
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> AuthedUser:
+    credentials_exception = _credentials_exception()
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM], options=JWT_DECODE_OPTIONS)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
     except jwt.PyJWTError:
         raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.username == username).first()
+
+    user_id = payload.get("uid")
+    role = payload.get("role")
+    if user_id is not None and role is not None:
+        return AuthedUser(id=user_id, username=username, role=role)
+
+    # Tokens issued before "uid" was added to the payload
+    user = (
+        db.query(models.User.id, models.User.username, models.User.role)
+        .filter(models.User.username == username)
+        .first()
+    )
     if user is None:
         raise credentials_exception
+    return AuthedUser(id=user.id, username=user.username, role=user.role)
+
+
+def get_current_user_full(
+    current_user: AuthedUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> models.User:
+    user = db.query(models.User).filter(models.User.id == current_user.id).first()
+    if user is None:
+        raise _credentials_exception()
     return user
 
 
-def require_admin(current_user: models.User) -> None:
+def require_admin(current_user: AuthedUser) -> None:
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Недостаточно прав")
 
+@app.on_event("startup")
+async def configure_threadpool():
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
 # Initialize admin user
 @app.on_event("startup")
 def startup_event():
-    db = next(get_db())
-    admin = db.query(models.User).filter(models.User.username == "admin").first()
-    if not admin:
-        admin = models.User(
-            username="admin",
-            password=get_password_hash("admin"),
-            role="admin",
-            full_name="Administrator",
-            is_active=True
-        )
-        db.add(admin)
-        db.commit()
+    db = SessionLocal()
+    try:
+        admin_id = db.query(models.User.id).filter(models.User.username == "admin").scalar()
+        if admin_id is None:
+            admin = models.User(
+                username="admin",
+                password=get_password_hash("admin"),
+                role="admin",
+                full_name="Administrator",
+                is_active=True
+            )
+            db.add(admin)
+            db.commit()
+    finally:
+        db.close()
 
 # Auth endpoints
+def _authenticate_user(db: Session, username: str, password: str):
+    user = db.execute(
+        select(
+            models.User.id,
+            models.User.username,
+            models.User.password,
+            models.User.role,
+            models.User.full_name,
+            models.User.is_active,
+        ).where(models.User.username == username)
+    ).first()
+    if not user or not verify_password(password, user.password):
+        return None
+    return user
+
 @app.post("/token")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await anyio.to_thread.run_sync(
+        _authenticate_user, db, form_data.username, form_data.password
+    )
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -616,7 +900,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
             detail="Account is not active"
         )
     
-    access_token = create_access_token(data={"sub": user.username, "role": user.role})
+    access_token = create_access_token(data={"sub": user.username, "role": user.role, "uid": user.id})
     return {
         "access_token": access_token,
         "token_type": "bearer",
@@ -625,7 +909,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     }
 
 @app.get("/me")
-def get_me(current_user: models.User = Depends(get_current_user)):
+def get_me(current_user: models.User = Depends(get_current_user_full)):
     return {
         "username": current_user.username,
         "role": current_user.role,
@@ -638,45 +922,54 @@ def get_products(
     q: Optional[str] = Query(None),
     is_return: Optional[bool] = Query(None),
     main_only: bool = Query(False),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    query = db.query(models.Product)
+    query = select(
+        models.Product.id,
+        models.Product.name,
+        models.Product.quantity,
+        models.Product.price,
+        models.Product.manager_id,
+        models.Product.is_return,
+        models.Product.created_at,
+    )
 
     archived_column = getattr(models.Product, "is_archived", None)
     if archived_column is not None:
-        query = query.filter(archived_column.is_(False))
+        query = query.where(archived_column.is_(False))
 
     if main_only:
-        query = query.filter(models.Product.manager_id.is_(None))
+        query = query.where(models.Product.manager_id.is_(None))
     elif current_user.role == "admin":
-        query = query.filter(models.Product.manager_id.is_(None))
+        query = query.where(models.Product.manager_id.is_(None))
     else:
-        query = query.filter(models.Product.manager_id == current_user.id)
+        query = query.where(models.Product.manager_id == current_user.id)
 
     if is_return is not None:
-        query = query.filter(models.Product.is_return == is_return)
+        query = query.where(models.Product.is_return == is_return)
     else:
-        query = query.filter(models.Product.is_return.is_(False))
+        query = query.where(models.Product.is_return.is_(False))
 
     search = (q or "").strip()
     if search:
         pattern = f"%{search}%"
-        query = query.filter(models.Product.name.ilike(pattern))
-        return query.order_by(models.Product.name.asc()).limit(50).all()
+        query = query.where(models.Product.name.ilike(pattern))
 
-    return query.order_by(models.Product.name.asc()).limit(50).all()
+    query = query.order_by(models.Product.name.asc()).limit(50)
+    # Rows are plain column values already; serialize them directly instead of re-validating each one
+    return ORJSONResponse(content=[dict(row) for row in db.execute(query).mappings()])
 
 @app.post("/products", response_model=schemas.Product)
 def create_product(
     product: schemas.ProductCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Только администратор может создавать товары")
     
-    db_product = models.Product(**product.dict())
+    db_product = models.Product(**product.model_dump())
     db.add(db_product)
     db.commit()
     db.refresh(db_product)
@@ -686,7 +979,7 @@ def create_product(
 def update_product(
     product_id: int,
     product: schemas.ProductUpdate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
@@ -699,7 +992,7 @@ def update_product(
     if not db_product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Товар не найден")
 
-    update_data = product.dict(exclude_unset=True)
+    update_data = product.model_dump(exclude_unset=True)
     if not update_data:
         return db_product
 
@@ -713,7 +1006,7 @@ def update_product(
 @app.delete("/products/{product_id}")
 def delete_product(
     product_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
@@ -743,42 +1036,55 @@ def delete_product(
     db.commit()
     return {"message": "Товар удалён"}
 
+SHOP_OUT_COLUMNS = (
+    models.Shop.id,
+    models.Shop.name,
+    models.Shop.address,
+    models.Shop.phone,
+    models.Shop.refrigerator_number,
+    models.Shop.debt,
+    models.Shop.manager_id,
+    models.Shop.manager_name,
+    models.Shop.created_at,
+)
+
+
 @app.get("/shops", response_model=List[schemas.ShopOut])
 def get_shops(
     manager_id: Optional[int] = Query(None),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
 
-    query = db.query(models.Shop)
+    query = select(*SHOP_OUT_COLUMNS)
     if manager_id is not None:
-        query = query.filter(models.Shop.manager_id == manager_id)
+        query = query.where(models.Shop.manager_id == manager_id)
 
-    return query.order_by(models.Shop.created_at.desc()).all()
+    return db.execute(query.order_by(models.Shop.created_at.desc())).mappings().all()
 
 
 @app.get("/shops/me", response_model=List[schemas.ShopOut])
 def get_my_shops(
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "manager":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Недостаточно прав")
 
-    return (
-        db.query(models.Shop)
-        .filter(models.Shop.manager_id == current_user.id)
+    query = (
+        select(*SHOP_OUT_COLUMNS)
+        .where(models.Shop.manager_id == current_user.id)
         .order_by(models.Shop.created_at.desc())
-        .all()
     )
+    return db.execute(query).mappings().all()
 
 
 @app.post("/shops", response_model=schemas.ShopOut)
 def create_shop(
     shop: schemas.ShopCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_full),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "manager":
@@ -791,7 +1097,7 @@ def create_shop(
 
     manager_name = current_user.full_name or current_user.username
     db_shop = models.Shop(
-        **shop.dict(),
+        **shop.model_dump(),
         manager_id=current_user.id,
         manager_name=manager_name,
     )
@@ -805,7 +1111,7 @@ def create_shop(
 def update_shop(
     shop_id: int,
     shop: schemas.ShopUpdate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_full),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "manager":
@@ -817,7 +1123,7 @@ def update_shop(
     if db_shop.manager_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Нет доступа к магазину")
 
-    update_data = shop.dict(exclude_unset=True)
+    update_data = shop.model_dump(exclude_unset=True)
 
     if "name" in update_data and not update_data["name"].strip():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Название обязательно")
@@ -838,7 +1144,7 @@ def update_shop(
 @app.delete("/shops/{shop_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_shop(
     shop_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "manager":
@@ -865,13 +1171,13 @@ def delete_shop(
 def adjust_shop_debt(
     shop_id: int,
     data: AdjustDebtRequest,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role not in ("admin", "manager"):
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    shop = db.query(models.Shop).filter(models.Shop.id == shop_id).first()
+    shop = db.query(models.Shop).filter(models.Shop.id == shop_id).with_for_update().first()
     if not shop:
         raise HTTPException(status_code=404, detail="Shop not found")
 
@@ -889,7 +1195,7 @@ def adjust_shop_debt(
 def pay_shop_debt(
     shop_id: int,
     data: schemas.ShopDebtPaymentCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role not in ("manager", "admin"):
@@ -898,7 +1204,7 @@ def pay_shop_debt(
     if data.amount <= 0:
         raise HTTPException(status_code=400, detail="Сумма должна быть больше 0")
 
-    shop = db.query(models.Shop).filter(models.Shop.id == shop_id).first()
+    shop = db.query(models.Shop).filter(models.Shop.id == shop_id).with_for_update().first()
     if not shop:
         raise HTTPException(status_code=404, detail="Магазин не найден")
 
@@ -923,7 +1229,7 @@ def pay_shop_debt(
 
 # Managers endpoints
 @app.get("/managers", response_model=List[schemas.Manager])
-def get_managers(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_user)):
+def get_managers(db: Session = Depends(get_db), current_user: AuthedUser = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     return db.query(models.User).filter(models.User.role == "manager").all()
@@ -931,7 +1237,7 @@ def get_managers(db: Session = Depends(get_db), current_user: models.User = Depe
 @app.post("/managers", response_model=schemas.Manager)
 def create_manager(
     manager: schemas.ManagerCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
@@ -957,7 +1263,7 @@ def create_manager(
 def update_manager(
     manager_id: int,
     manager: schemas.ManagerUpdate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
@@ -990,17 +1296,16 @@ def _attach_dispatch_items(db: Session, rows: Sequence[Dict[str, Any]]):
                        di.product_id,
                        di.quantity,
                        di.price,
-                       COALESCE(p.name, '') AS product_name
+                       COALESCE(di.product_name, '') AS product_name
                 FROM dispatch_items di
-                LEFT JOIN products p ON p.id = di.product_id
                 WHERE di.dispatch_id IN :dispatch_ids
-                ORDER BY p.name ASC, di.id ASC
+                ORDER BY di.product_name ASC, di.id ASC
                 """
             )
             .bindparams(bindparam("dispatch_ids", expanding=True))
         )
 
-        for item in db.execute(item_query, {"dispatch_ids": dispatch_ids}).mappings().all():
+        for item in db.execute(item_query, {"dispatch_ids": dispatch_ids}).mappings():
             items_map[item["dispatch_id"]].append(
                 {
                     "product_id": item["product_id"],
@@ -1010,12 +1315,7 @@ def _attach_dispatch_items(db: Session, rows: Sequence[Dict[str, Any]]):
                 }
             )
 
-    result: List[Dict[str, Any]] = []
-    for row in rows:
-        data = dict(row)
-        data["items"] = items_map.get(row["id"], [])
-        result.append(data)
-    return result
+    return [{**row, "items": items_map.get(row["id"], [])} for row in rows]
 
 
 def _fetch_dispatch(db: Session, dispatch_id: int) -> Optional[Dict[str, Any]]:
@@ -1024,12 +1324,11 @@ def _fetch_dispatch(db: Session, dispatch_id: int) -> Optional[Dict[str, Any]]:
             """
             SELECT d.id,
                    d.manager_id,
-                   COALESCE(u.full_name, u.username) AS manager_name,
+                   d.manager_name,
                    COALESCE(d.status, 'pending') AS status,
                    d.created_at,
                    d.accepted_at
             FROM dispatches d
-            LEFT JOIN users u ON u.id = d.manager_id
             WHERE d.id = :dispatch_id
             """
         ),
@@ -1042,10 +1341,31 @@ def _fetch_dispatch(db: Session, dispatch_id: int) -> Optional[Dict[str, Any]]:
     return _attach_dispatch_items(db, [dispatch_row])[0]
 
 
+def _build_dispatch_payload(
+    dispatch_row: Dict[str, Any],
+    items: Sequence[Dict[str, Any]],
+    product_names: Dict[int, str],
+) -> Dict[str, Any]:
+    data = dict(dispatch_row)
+    data["items"] = sorted(
+        (
+            {
+                "product_id": item["product_id"],
+                "product_name": product_names.get(item["product_id"], ""),
+                "quantity": item["quantity"],
+                "price": float(item["price"]) if item["price"] is not None else 0.0,
+            }
+            for item in items
+        ),
+        key=lambda item: item["product_name"],
+    )
+    return data
+
+
 @app.post("/dispatch", response_model=schemas.DispatchOut)
 def create_dispatch(
     dispatch: schemas.DispatchCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
@@ -1084,7 +1404,7 @@ def create_dispatch(
     if archived_column is not None:
         products_query = products_query.filter(archived_column.is_(False))
 
-    products = products_query.with_for_update().all()
+    products = products_query.order_by(models.Product.id).all()
     product_map = {product.id: product for product in products}
     missing_ids = [str(pid) for pid in product_ids if pid not in product_map]
     if missing_ids:
@@ -1118,18 +1438,48 @@ def create_dispatch(
         for product_id, data in aggregated.items()
     ]
 
+    manager_name = manager.full_name or manager.username
+    product_names = {product_id: product.name or "" for product_id, product in product_map.items()}
     now = datetime.now(timezone.utc)
 
     try:
+        for product_id in sorted(aggregated):
+            requested = aggregated[product_id]["quantity"]
+            decremented = db.execute(
+                update(models.Product)
+                .where(models.Product.id == product_id, models.Product.quantity >= requested)
+                .values(quantity=models.Product.quantity - requested)
+                .returning(models.Product.id)
+            ).first()
+            if decremented is None:
+                # Stock changed after the check above; report the current level
+                db.rollback()
+                available = db.query(models.Product.quantity).filter(models.Product.id == product_id).scalar()
+                raise HTTPException(
+                    status_code=400,
+                    detail={
+                        "error": "INSUFFICIENT_STOCK",
+                        "message": "Не хватает товара на складе",
+                        "items": [
+                            {"product_id": product_id, "requested": requested, "available": available or 0}
+                        ],
+                    },
+                )
+
         created = db.execute(
             text(
                 """
-                INSERT INTO dispatches (manager_id, status, created_at)
-                VALUES (:manager_id, :status, :created_at)
-                RETURNING id
+                INSERT INTO dispatches (manager_id, manager_name, status, created_at)
+                VALUES (:manager_id, :manager_name, :status, :created_at)
+                RETURNING id, created_at
                 """
             ),
-            {"manager_id": dispatch.manager_id, "status": "pending", "created_at": now},
+            {
+                "manager_id": dispatch.manager_id,
+                "manager_name": manager_name,
+                "status": "pending",
+                "created_at": now,
+            },
         ).mappings().first()
 
         if not created:
@@ -1139,24 +1489,37 @@ def create_dispatch(
 
         item_stmt = text(
             """
-            INSERT INTO dispatch_items (dispatch_id, product_id, quantity, price)
-            VALUES (:dispatch_id, :product_id, :quantity, :price)
+            INSERT INTO dispatch_items (dispatch_id, product_id, product_name, quantity, price)
+            VALUES (:dispatch_id, :product_id, :product_name, :quantity, :price)
             """
         )
 
-        for item in validated_items:
-            product = product_map[item["product_id"]]
-            product.quantity = (product.quantity or 0) - item["quantity"]
-
-            db.execute(
-                item_stmt,
+        db.execute(
+            item_stmt,
+            [
                 {
                     "dispatch_id": dispatch_id,
                     "product_id": item["product_id"],
+                    "product_name": product_names[item["product_id"]],
                     "quantity": item["quantity"],
                     "price": item["price"],
-                },
-            )
+                }
+                for item in validated_items
+            ],
+        )
+
+        response = _build_dispatch_payload(
+            {
+                "id": dispatch_id,
+                "manager_id": manager.id,
+                "manager_name": manager_name,
+                "status": "pending",
+                "created_at": created["created_at"],
+                "accepted_at": None,
+            },
+            validated_items,
+            product_names,
+        )
 
         db.commit()
     except HTTPException:
@@ -1166,31 +1529,74 @@ def create_dispatch(
         db.rollback()
         raise
 
-    dispatch_row = _fetch_dispatch(db, dispatch_id)
-    if not dispatch_row:
-        raise HTTPException(status_code=404, detail="Отправка не найдена")
-
-    return dispatch_row
+    return response
 
 
 # Dispatch history and acceptance
+DISPATCH_STREAM_BATCH_SIZE = 500
+
+
+def _encode_dispatch_batch(db: Session, rows: Sequence[Dict[str, Any]]) -> bytes:
+    batch = _attach_dispatch_items(db, rows)
+    if not batch:
+        return b""
+    # Encode the whole batch in one call and splice it into the stream without its brackets
+    adapter = schemas.DispatchOutList
+    return adapter.dump_json(adapter.validate_python(batch))[1:-1]
+
+
+def _stream_dispatches(query: str, params: Dict[str, Any]) -> Iterator[bytes]:
+    # Runs after the request dependencies are torn down, so it owns its session.
+    # The query and the first batch run before the response starts, so early failures still return an HTTP error
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            text(query).execution_options(yield_per=DISPATCH_STREAM_BATCH_SIZE),
+            params,
+        )
+        partitions = result.mappings().partitions()
+        first_chunk = _encode_dispatch_batch(db, next(partitions, []))
+    except Exception:
+        db.close()
+        raise
+    return _stream_dispatch_batches(db, first_chunk, partitions)
+
+
+def _stream_dispatch_batches(
+    db: Session,
+    first_chunk: bytes,
+    partitions: Iterator[Sequence[Dict[str, Any]]],
+) -> Iterator[bytes]:
+    try:
+        separator = b"["
+        if first_chunk:
+            yield separator + first_chunk
+            separator = b","
+        for rows in partitions:
+            chunk = _encode_dispatch_batch(db, rows)
+            if chunk:
+                yield separator + chunk
+                separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+    finally:
+        db.close()
+
+
 @app.get("/dispatch", response_model=List[schemas.DispatchOut])
 def list_dispatches(
     manager_id: Optional[int] = Query(None),
     status_filter: Optional[str] = Query(None, alias="status"),
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     params: Dict[str, Any] = {}
     base_query = """
         SELECT d.id,
                d.manager_id,
-               COALESCE(u.full_name, u.username) AS manager_name,
+               d.manager_name,
                COALESCE(d.status, 'pending') AS status,
                d.created_at,
                d.accepted_at
         FROM dispatches d
-        LEFT JOIN users u ON u.id = d.manager_id
         WHERE 1=1
     """
 
@@ -1207,17 +1613,13 @@ def list_dispatches(
 
     base_query += " ORDER BY d.created_at DESC, d.id DESC"
 
-    rows = db.execute(text(base_query), params).mappings().all()
-    if not rows:
-        return []
-
-    return _attach_dispatch_items(db, rows)
+    return StreamingResponse(_stream_dispatches(base_query, params), media_type="application/json")
 
 
 @app.get("/dispatch/{dispatch_id}", response_model=schemas.DispatchOut)
 def get_dispatch(
     dispatch_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     dispatch_row = _fetch_dispatch(db, dispatch_id)
@@ -1236,7 +1638,7 @@ def get_dispatch(
 @app.post("/dispatch/{dispatch_id}/accept", response_model=schemas.DispatchOut)
 def accept_dispatch(
     dispatch_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "manager":
@@ -1247,7 +1649,9 @@ def accept_dispatch(
             """
             SELECT d.id,
                    d.manager_id,
-                   COALESCE(d.status, 'pending') AS status
+                   d.manager_name,
+                   COALESCE(d.status, 'pending') AS status,
+                   d.created_at
             FROM dispatches d
             WHERE d.id = :dispatch_id
             """
@@ -1270,7 +1674,7 @@ def accept_dispatch(
     items = db.execute(
         text(
             """
-            SELECT product_id, quantity, price
+            SELECT product_id, product_name, quantity, price
             FROM dispatch_items
             WHERE dispatch_id = :dispatch_id
             ORDER BY id
@@ -1286,34 +1690,38 @@ def accept_dispatch(
     products_for_update: Dict[int, models.Product] = {}
 
     try:
-        for item in items:
-            product_query = db.query(models.Product).filter(
-                models.Product.id == item["product_id"],
-                models.Product.manager_id.is_(None),
-                models.Product.is_return.is_(False),
-            )
-            if archived_column is not None:
-                product_query = product_query.filter(archived_column.is_(False))
+        product_ids = sorted({item["product_id"] for item in items})
+        product_query = db.query(models.Product).filter(
+            models.Product.id.in_(product_ids),
+            models.Product.manager_id.is_(None),
+            models.Product.is_return.is_(False),
+        )
+        if archived_column is not None:
+            product_query = product_query.filter(archived_column.is_(False))
 
-            product = product_query.first()
+        for product in product_query.order_by(models.Product.id).all():
+            products_for_update[product.id] = product
 
-            if not product:
+        for item in items:
+            if item["product_id"] not in products_for_update:
                 raise HTTPException(status_code=404, detail=f"Товар {item['product_id']} не найден на складе")
 
-            products_for_update[item["product_id"]] = product
+        product_names = {product.name for product in products_for_update.values()}
+        manager_product_query = db.query(models.Product).filter(
+            models.Product.manager_id == current_user.id,
+            models.Product.name.in_(product_names),
+            models.Product.is_return.is_(False),
+        )
+        if archived_column is not None:
+            manager_product_query = manager_product_query.filter(archived_column.is_(False))
+
+        manager_products: Dict[str, models.Product] = {}
+        for manager_product in manager_product_query.order_by(models.Product.id).with_for_update().all():
+            manager_products.setdefault(manager_product.name, manager_product)
 
         for item in items:
             product = products_for_update[item["product_id"]]
-
-            manager_product_query = db.query(models.Product).filter(
-                models.Product.manager_id == current_user.id,
-                models.Product.name == product.name,
-                models.Product.is_return.is_(False),
-            )
-            if archived_column is not None:
-                manager_product_query = manager_product_query.filter(archived_column.is_(False))
-
-            manager_product = manager_product_query.with_for_update().first()
+            manager_product = manager_products.get(product.name)
             price_value = float(item["price"]) if item["price"] is not None else product.price
 
             if manager_product:
@@ -1328,17 +1736,32 @@ def accept_dispatch(
                     is_return=False,
                 )
                 db.add(manager_product)
+                manager_products[product.name] = manager_product
 
-        accepted_at = datetime.now(timezone.utc)
-        db.execute(
+        # Echo the stored value so the response matches what GET /dispatch returns for the same row
+        accepted_at = db.execute(
             text(
                 """
                 UPDATE dispatches
                 SET status = 'sent', accepted_at = :accepted_at
                 WHERE id = :dispatch_id
+                RETURNING accepted_at
                 """
             ),
-            {"accepted_at": accepted_at, "dispatch_id": dispatch_id},
+            {"accepted_at": datetime.now(timezone.utc), "dispatch_id": dispatch_id},
+        ).scalar_one()
+
+        response = _build_dispatch_payload(
+            {
+                "id": dispatch_id,
+                "manager_id": dispatch_row["manager_id"],
+                "manager_name": dispatch_row["manager_name"],
+                "status": "sent",
+                "created_at": dispatch_row["created_at"],
+                "accepted_at": accepted_at,
+            },
+            items,
+            {item["product_id"]: item["product_name"] or "" for item in items},
         )
 
         db.commit()
@@ -1349,28 +1772,24 @@ def accept_dispatch(
         db.rollback()
         raise
 
-    updated = _fetch_dispatch(db, dispatch_id)
-    if not updated:
-        raise HTTPException(status_code=404, detail="Отправка не найдена")
-
-    return updated
+    return response
 
 # Orders endpoints
 @app.post("/orders")
 def create_order(
     order: schemas.OrderCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "manager":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    # Check shop exists
-    shop = db.query(models.Shop).filter(models.Shop.id == order.shop_id).first()
+    # Check shop exists; lock it since its debt is updated below
+    shop = db.query(models.Shop).filter(models.Shop.id == order.shop_id).with_for_update().first()
     if not shop:
         raise HTTPException(status_code=404, detail="Shop not found")
     
-    total_order_amount = 0.0
+    total_order_amount = ZERO
 
     for item in order.items:
         # Check product availability
@@ -1399,13 +1818,13 @@ def create_order(
         )
         db.add(db_order)
 
-    paid_amount = max(order.paid_amount or 0.0, 0.0)
+    paid_amount = max(order.paid_amount, ZERO)
     debt_change = total_order_amount - paid_amount
     if debt_change < 0:
-        debt_change = 0.0
+        debt_change = ZERO
 
     if debt_change > 0:
-        shop.debt = (shop.debt or 0.0) + debt_change
+        shop.debt = float(Decimal(str(shop.debt or 0)) + debt_change)
 
     db.commit()
     db.refresh(shop)
@@ -1414,30 +1833,37 @@ def create_order(
 # Returns endpoints
 @app.get("/manager/stock", response_model=List[schemas.ManagerStockItem])
 def get_manager_stock(
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "manager":
         raise HTTPException(status_code=403, detail="Недостаточно прав")
 
     archived_column = getattr(models.Product, "is_archived", None)
-    products_query = db.query(models.Product).filter(
+    products_query = select(
+        models.Product.id.label("product_id"),
+        models.Product.name,
+        models.Product.quantity,
+        models.Product.price,
+    ).where(
         models.Product.manager_id == current_user.id,
         models.Product.is_return.is_(False),
     )
     if archived_column is not None:
-        products_query = products_query.filter(archived_column.is_(False))
+        products_query = products_query.where(archived_column.is_(False))
 
-    products = products_query.order_by(models.Product.name.asc()).all()
-    return [
-        {
-            "product_id": product.id,
-            "name": product.name,
-            "quantity": product.quantity,
-            "price": product.price,
-        }
-        for product in products
-    ]
+    rows = db.execute(products_query.order_by(models.Product.name.asc())).mappings()
+    return ORJSONResponse(content=[dict(row) for row in rows])
+
+
+def _list_response(adapter: TypeAdapter, rows: Sequence[Dict[str, Any]]) -> Response:
+    # Validate and encode the whole list in one pass through the cached adapter
+    return Response(content=adapter.dump_json(adapter.validate_python(rows)), media_type="application/json")
+
+
+def _model_response(model: BaseModel) -> Response:
+    # Encode an already validated nested report directly; FastAPI would otherwise dump it to dicts and validate it again
+    return Response(content=model.model_dump_json(), media_type="application/json")
 
 
 def _fetch_shop_orders(
@@ -1447,9 +1873,9 @@ def _fetch_shop_orders(
     order_ids: Optional[List[int]] = None,
 ) -> List[Dict[str, Any]]:
     query = db.query(models.ShopOrder).options(
-        joinedload(models.ShopOrder.items).joinedload(models.ShopOrderItem.product),
-        joinedload(models.ShopOrder.shop),
+        undefer(models.ShopOrder.items_cache),
         joinedload(models.ShopOrder.payment),
+        raiseload("*"),
     )
 
     if manager_id is not None:
@@ -1463,27 +1889,39 @@ def _fetch_shop_orders(
         .all()
     )
 
+    # Orders written before items_cache existed (and not backfilled) fall back to the item table
+    uncached_items: Dict[int, List[Dict[str, Any]]] = {
+        order.id: [] for order in orders if order.items_cache is None
+    }
+    if uncached_items:
+        item_rows = (
+            db.query(models.ShopOrderItem)
+            .filter(models.ShopOrderItem.order_id.in_(list(uncached_items)))
+            .order_by(models.ShopOrderItem.id)
+            .all()
+        )
+        for item in item_rows:
+            uncached_items[item.order_id].append(
+                {
+                    "product_id": item.product_id,
+                    "product_name": item.product_name or "",
+                    "quantity": _to_float(item.quantity),
+                    "price": _to_optional_float(item.price),
+                    "is_bonus": bool(item.is_bonus),
+                    "is_return": bool(getattr(item, "is_return", False)),
+                }
+            )
+
     results: List[Dict[str, Any]] = []
     for order in orders:
-        items = sorted(order.items, key=lambda item: item.id)
         results.append(
             {
                 "id": order.id,
                 "manager_id": order.manager_id,
                 "shop_id": order.shop_id,
-                "shop_name": order.shop.name if order.shop else "",
+                "shop_name": order.shop_name or "",
                 "created_at": order.created_at,
-                "items": [
-                    {
-                        "product_id": item.product_id,
-                        "product_name": item.product.name if item.product else "",
-                        "quantity": _to_float(item.quantity),
-                        "price": _to_optional_float(item.price),
-                        "is_bonus": bool(item.is_bonus),
-                        "is_return": bool(getattr(item, "is_return", False)),
-                    }
-                    for item in items
-                ],
+                "items": order.items_cache if order.items_cache is not None else uncached_items[order.id],
                 "payment":
                     {
                         "total_amount": _to_float(order.payment.total_amount),
@@ -1508,9 +1946,8 @@ def _fetch_shop_returns(
     return_ids: Optional[List[int]] = None,
 ) -> List[Dict[str, Any]]:
     query = db.query(models.ShopReturn).options(
-        joinedload(models.ShopReturn.items).joinedload(models.ShopReturnItem.product),
-        joinedload(models.ShopReturn.manager),
-        joinedload(models.ShopReturn.shop),
+        selectinload(models.ShopReturn.items),
+        raiseload("*"),
     )
 
     if manager_id is not None:
@@ -1528,21 +1965,18 @@ def _fetch_shop_returns(
     for return_doc in returns:
         items = sorted(return_doc.items, key=lambda item: item.id)
         total_quantity = sum(Decimal(str(item.quantity)) for item in items)
-        manager_name = ""
-        if return_doc.manager:
-            manager_name = return_doc.manager.full_name or return_doc.manager.username or ""
         results.append(
             {
                 "id": return_doc.id,
                 "manager_id": return_doc.manager_id,
-                "manager_name": manager_name,
+                "manager_name": return_doc.manager_name or "",
                 "shop_id": return_doc.shop_id,
-                "shop_name": return_doc.shop.name if return_doc.shop else "",
+                "shop_name": return_doc.shop_name or "",
                 "created_at": return_doc.created_at,
                 "items": [
                     {
                         "product_id": item.product_id,
-                        "product_name": item.product.name if item.product else "",
+                        "product_name": item.product_name or "",
                         "quantity": _to_float(item.quantity),
                     }
                     for item in items
@@ -1698,8 +2132,7 @@ def _build_manager_daily_report(
     )
 
     deliveries_rows = (
-        db.query(models.ShopOrder)
-        .options(joinedload(models.ShopOrder.shop))
+        db.query(models.ShopOrder.id, models.ShopOrder.created_at, models.ShopOrder.shop_name)
         .filter(models.ShopOrder.manager_id == manager.id)
         .filter(models.ShopOrder.created_at >= start, models.ShopOrder.created_at < end)
         .order_by(models.ShopOrder.created_at.asc(), models.ShopOrder.id.asc())
@@ -1707,7 +2140,7 @@ def _build_manager_daily_report(
     )
 
     returns_to_main_rows = (
-        db.query(models.ManagerReturn)
+        db.query(models.ManagerReturn.id, models.ManagerReturn.created_at)
         .filter(models.ManagerReturn.manager_id == manager.id)
         .filter(models.ManagerReturn.created_at >= start, models.ManagerReturn.created_at < end)
         .order_by(models.ManagerReturn.created_at.asc(), models.ManagerReturn.id.asc())
@@ -1715,8 +2148,7 @@ def _build_manager_daily_report(
     )
 
     returns_from_shops_rows = (
-        db.query(models.ShopReturn)
-        .options(joinedload(models.ShopReturn.shop))
+        db.query(models.ShopReturn.id, models.ShopReturn.created_at, models.ShopReturn.shop_name)
         .filter(models.ShopReturn.manager_id == manager.id)
         .filter(models.ShopReturn.created_at >= start, models.ShopReturn.created_at < end)
         .order_by(models.ShopReturn.created_at.asc(), models.ShopReturn.id.asc())
@@ -1735,35 +2167,41 @@ def _build_manager_daily_report(
         return_from_shops_amount=_to_decimal(return_from_shops_amount_raw),
     )
 
-    deliveries = [
-        schemas.MovementRow(
-            id=order.id,
-            time=order.created_at,
-            shop_name=order.shop.name if order.shop else None,
-            type="delivery",
-        )
-        for order in deliveries_rows
-    ]
+    deliveries = schemas.MovementRowList.validate_python(
+        [
+            {
+                "id": order.id,
+                "time": order.created_at,
+                "shop_name": order.shop_name,
+                "type": "delivery",
+            }
+            for order in deliveries_rows
+        ]
+    )
 
-    returns_to_main = [
-        schemas.MovementRow(
-            id=return_doc.id,
-            time=return_doc.created_at,
-            shop_name=None,
-            type="return_to_main",
-        )
-        for return_doc in returns_to_main_rows
-    ]
+    returns_to_main = schemas.MovementRowList.validate_python(
+        [
+            {
+                "id": return_doc.id,
+                "time": return_doc.created_at,
+                "shop_name": None,
+                "type": "return_to_main",
+            }
+            for return_doc in returns_to_main_rows
+        ]
+    )
 
-    returns_from_shops = [
-        schemas.MovementRow(
-            id=return_doc.id,
-            time=return_doc.created_at,
-            shop_name=return_doc.shop.name if return_doc.shop else None,
-            type="return_from_shop",
-        )
-        for return_doc in returns_from_shops_rows
-    ]
+    returns_from_shops = schemas.MovementRowList.validate_python(
+        [
+            {
+                "id": return_doc.id,
+                "time": return_doc.created_at,
+                "shop_name": return_doc.shop_name,
+                "type": "return_from_shop",
+            }
+            for return_doc in returns_from_shops_rows
+        ]
+    )
 
     report = schemas.ManagerDailyReport(
         date=report_date,
@@ -1783,7 +2221,8 @@ def _fetch_manager_returns(
     return_ids: Optional[List[int]] = None,
 ) -> List[Dict[str, Any]]:
     query = db.query(models.ManagerReturn).options(
-        joinedload(models.ManagerReturn.items).joinedload(models.ManagerReturnItem.product)
+        selectinload(models.ManagerReturn.items),
+        raiseload("*"),
     )
 
     if manager_id is not None:
@@ -1808,7 +2247,7 @@ def _fetch_manager_returns(
                 "items": [
                     {
                         "product_id": item.product_id,
-                        "product_name": item.product.name if item.product else "",
+                        "product_name": item.product_name or "",
                         "quantity": _to_float(item.quantity),
                     }
                     for item in items
@@ -1822,7 +2261,7 @@ def _fetch_manager_returns(
 @app.post("/returns", response_model=schemas.ReturnCreated)
 def create_return(
     return_data: schemas.ReturnCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "manager":
@@ -1852,7 +2291,7 @@ def create_return(
             if archived_column is not None:
                 manager_products_query = manager_products_query.filter(archived_column.is_(False))
 
-            manager_products = manager_products_query.with_for_update().all()
+            manager_products = manager_products_query.order_by(models.Product.id).with_for_update().all()
             manager_map = {product.id: product for product in manager_products}
             missing_ids = [str(pid) for pid in product_ids if pid not in manager_map]
             if missing_ids:
@@ -1878,7 +2317,7 @@ def create_return(
             if archived_column is not None:
                 base_query = base_query.filter(archived_column.is_(False))
 
-            base_products = base_query.with_for_update().all()
+            base_products = base_query.order_by(models.Product.id).with_for_update().all()
             base_map = {product.name: product for product in base_products}
             missing_base = [name for name in base_names if name not in base_map]
             if missing_base:
@@ -1910,6 +2349,7 @@ def create_return(
                 """
             )
 
+            item_rows: List[Dict[str, Any]] = []
             for product_id, quantity in aggregated.items():
                 manager_product = manager_map[product_id]
                 base_product = base_map[manager_product.name]
@@ -1917,14 +2357,15 @@ def create_return(
                 manager_product.quantity -= quantity
                 base_product.quantity += quantity
 
-                db.execute(
-                    item_stmt,
+                item_rows.append(
                     {
                         "return_id": return_id,
                         "product_id": base_product.id,
                         "quantity": quantity,
-                    },
+                    }
                 )
+
+            db.execute(item_stmt, item_rows)
     except HTTPException:
         raise
     except IntegrityError as exc:
@@ -1937,7 +2378,7 @@ def create_return(
 
 @app.get("/returns", response_model=List[schemas.ReturnListItem])
 def list_returns(
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role not in ("admin", "manager"):
@@ -1967,7 +2408,7 @@ def list_returns(
 @app.get("/returns/{return_id}", response_model=schemas.ReturnDetail)
 def get_return_detail(
     return_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     header = db.execute(
@@ -2018,26 +2459,30 @@ def get_return_detail(
     }
 
 # Incoming endpoints
+INCOMING_COPY_THRESHOLD = 1000
+INCOMING_ITEM_COLUMNS = ("incoming_id", "product_id", "product_name", "quantity", "price_at_time")
+
+
+def _copy_rows(db: Session, table: str, columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> None:
+    # COPY through the session's own connection so the rows stay inside the current transaction
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    with db.connection().connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
 @app.post("/incoming", response_model=schemas.IncomingCreated)
 def create_incoming(
     incoming: schemas.IncomingCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admin can create incoming")
 
-    items: List[schemas.IncomingItemCreate] = []
-
-    if incoming.items:
-        items = incoming.items
-    elif incoming.product_id is not None and incoming.quantity is not None:
-        items = [
-            schemas.IncomingItemCreate(
-                product_id=incoming.product_id,
-                quantity=incoming.quantity,
-            )
-        ]
+    payload = incoming.root
+    items = payload.items if isinstance(payload, schemas.IncomingBatch) else [payload]
 
     if not items:
         raise HTTPException(status_code=400, detail="Необходимо указать товары")
@@ -2046,7 +2491,7 @@ def create_incoming(
     for item in items:
         if item.quantity <= 0:
             raise HTTPException(status_code=400, detail="Количество должно быть больше 0")
-        aggregated[item.product_id] = aggregated.get(item.product_id, 0) + int(item.quantity)
+        aggregated[item.product_id] = aggregated.get(item.product_id, 0) + _whole_quantity(item.quantity)
 
     product_ids = list(aggregated.keys())
     if not product_ids:
@@ -2057,50 +2502,52 @@ def create_incoming(
     incoming_id: Optional[int] = None
 
     try:
-        products_query = db.query(models.Product).filter(
-            models.Product.id.in_(product_ids),
-            models.Product.manager_id.is_(None),
-            models.Product.is_return.is_(False),
-        )
-        if archived_column is not None:
-            products_query = products_query.filter(archived_column.is_(False))
-
-        products = products_query.with_for_update().all()
-        found_ids = {product.id for product in products}
-        if len(found_ids) != len(product_ids):
-            raise HTTPException(status_code=404, detail="Товар не найден")
-
-        product_map = {product.id: product for product in products}
-
-        incoming_row = models.Incoming(
-            created_at=now,
-            created_by_admin_id=current_user.id,
-        )
-        db.add(incoming_row)
-        db.flush()
-
-        incoming_id = incoming_row.id
-
-        for product in products:
-            product.quantity = (product.quantity or 0) + aggregated[product.id]
-
-        for product_id, quantity in aggregated.items():
-            product = product_map.get(product_id)
-            if product is None:
-                raise HTTPException(status_code=404, detail=f"Товар {product_id} не найден")
+        snapshots: Dict[int, Any] = {}
+        for product_id in sorted(product_ids):
+            increment_stmt = (
+                update(models.Product)
+                .where(
+                    models.Product.id == product_id,
+                    models.Product.manager_id.is_(None),
+                    models.Product.is_return.is_(False),
+                )
+                .values(quantity=func.coalesce(models.Product.quantity, 0) + aggregated[product_id])
+                .returning(models.Product.id, models.Product.name, models.Product.price)
+            )
+            if archived_column is not None:
+                increment_stmt = increment_stmt.where(archived_column.is_(False))
 
-            price_at_time = product.price if product.price is not None else 0
+            updated = db.execute(increment_stmt).first()
+            if updated is None:
+                raise HTTPException(status_code=404, detail="Товар не найден")
+            snapshots[updated.id] = updated
 
-            item_row = models.IncomingItem(
-                incoming_id=incoming_id,
-                product_id=product_id,
-                quantity=quantity,
-                price_at_time=price_at_time,
+        created = db.execute(
+            insert(models.Incoming)
+            .values(created_at=now, created_by_admin_id=current_user.id)
+            .returning(models.Incoming.id, models.Incoming.created_at)
+        ).one()
+        incoming_id = created.id
+
+        item_rows = [
+            (
+                incoming_id,
+                product_id,
+                snapshots[product_id].name,
+                quantity,
+                snapshots[product_id].price if snapshots[product_id].price is not None else 0,
+            )
+            for product_id, quantity in aggregated.items()
+        ]
+        if engine.dialect.driver == "psycopg2" and len(item_rows) >= INCOMING_COPY_THRESHOLD:
+            _copy_rows(db, models.IncomingItem.__tablename__, INCOMING_ITEM_COLUMNS, item_rows)
+        else:
+            db.execute(
+                insert(models.IncomingItem),
+                [dict(zip(INCOMING_ITEM_COLUMNS, row)) for row in item_rows],
             )
-            db.add(item_row)
 
         db.commit()
-        db.refresh(incoming_row)
     except HTTPException:
         db.rollback()
         raise
@@ -2117,12 +2564,12 @@ def create_incoming(
             detail=f"Ошибка базы данных при создании поступления: {exc}",
         ) from exc
 
-    return {"id": incoming_id, "created_at": incoming_row.created_at}
+    return {"id": incoming_id, "created_at": created.created_at}
 
 
 @app.get("/incoming", response_model=List[schemas.IncomingListItem])
 def list_incoming(
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
@@ -2137,7 +2584,7 @@ def list_incoming(
 @app.get("/incoming/{incoming_id}", response_model=schemas.IncomingDetail)
 def get_incoming_detail(
     incoming_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
@@ -2155,10 +2602,9 @@ def get_incoming_detail(
         text(
             """
             SELECT ii.product_id,
-                   COALESCE(p.name, '') AS product_name,
+                   COALESCE(ii.product_name, '') AS product_name,
                    ii.quantity
             FROM incoming_items ii
-            LEFT JOIN products p ON p.id = ii.product_id
             WHERE ii.incoming_id = :incoming_id
             ORDER BY ii.id
             """
@@ -2237,7 +2683,7 @@ def _calculate_driver_daily_balance(db: Session, manager_id: int):
 @app.post("/driver/daily-report", response_model=schemas.DriverDailyReportOut)
 def create_driver_daily_report(
     data: schemas.DriverDailyReportCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "manager":
@@ -2271,7 +2717,7 @@ def create_driver_daily_report(
 
 @app.get("/driver/daily-balance", response_model=schemas.DriverBalanceOut)
 def get_driver_daily_balance(
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "manager":
@@ -2293,7 +2739,7 @@ def get_driver_daily_reports(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     manager_id: Optional[int] = Query(None),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "admin":
@@ -2319,7 +2765,7 @@ def get_driver_daily_reports(
 @app.get("/reports/manager/daily", response_model=schemas.ManagerDailyReport)
 def get_manager_daily_report(
     report_date: date = Query(..., alias="date"),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "manager":
@@ -2330,14 +2776,14 @@ def get_manager_daily_report(
         manager_id=current_user.id,
         report_date=report_date,
     )
-    return report
+    return _model_response(report)
 
 
 @app.get("/reports/admin/daily", response_model=schemas.AdminDailyReport)
 def get_admin_daily_report(
     manager_id: int = Query(...),
     report_date: date = Query(..., alias="date"),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "admin":
@@ -2349,10 +2795,13 @@ def get_admin_daily_report(
         report_date=report_date,
     )
     manager_name = manager.full_name or manager.username
-    return schemas.AdminDailyReport(
-        manager_id=manager.id,
-        manager_name=manager_name,
-        **report.model_dump(),
+    return _model_response(
+        # dict(report) is a shallow field mapping, so the already validated rows and summary are reused as-is
+        schemas.AdminDailyReport(
+            manager_id=manager.id,
+            manager_name=manager_name,
+            **dict(report),
+        )
     )
 
 
@@ -2361,7 +2810,7 @@ def get_admin_shop_period_report(
     shop_id: int = Query(...),
     date_from: date = Query(...),
     date_to: date = Query(...),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "admin":
@@ -2429,10 +2878,10 @@ def get_admin_shop_period_report(
     current_day = date_from
     while current_day <= date_to:
         day_stats[current_day] = {
-            "issued_total": Decimal("0"),
-            "returns_total": Decimal("0"),
-            "bonuses_total": Decimal("0"),
-            "debt_total": Decimal("0"),
+            "issued_total": ZERO,
+            "returns_total": ZERO,
+            "bonuses_total": ZERO,
+            "debt_total": ZERO,
         }
         current_day += timedelta(days=1)
 
@@ -2509,16 +2958,18 @@ def get_admin_shop_period_report(
         if day in day_stats:
             day_stats[day]["debt_total"] = _to_decimal(row.total)
 
-    days = [
-        schemas.ShopDayStat(
-            date=day,
-            issued_total=values["issued_total"],
-            returns_total=values["returns_total"],
-            bonuses_total=values["bonuses_total"],
-            debt_total=values["debt_total"],
-        )
-        for day, values in sorted(day_stats.items())
-    ]
+    days = schemas.ShopDayStatList.validate_python(
+        [
+            {
+                "date": day,
+                "issued_total": values["issued_total"],
+                "returns_total": values["returns_total"],
+                "bonuses_total": values["bonuses_total"],
+                "debt_total": values["debt_total"],
+            }
+            for day, values in sorted(day_stats.items())
+        ]
+    )
 
     deliveries_rows = (
         db.query(
@@ -2548,17 +2999,19 @@ def get_admin_shop_period_report(
         .all()
     )
 
-    deliveries = [
-        schemas.ShopDocumentRow(
-            id=row.id,
-            type="delivery",
-            date=row.created_at,
-            amount=_to_decimal(row.amount),
-            manager_name=(row.full_name or row.username or ""),
-            debt_amount=_to_decimal(row.debt_amount),
-        )
-        for row in deliveries_rows
-    ]
+    deliveries = schemas.ShopDocumentRowList.validate_python(
+        [
+            {
+                "id": row.id,
+                "type": "delivery",
+                "date": row.created_at,
+                "amount": _to_decimal(row.amount),
+                "manager_name": (row.full_name or row.username or ""),
+                "debt_amount": _to_decimal(row.debt_amount),
+            }
+            for row in deliveries_rows
+        ]
+    )
 
     returns_rows = (
         db.query(
@@ -2584,16 +3037,18 @@ def get_admin_shop_period_report(
         .all()
     )
 
-    returns_from_shop = [
-        schemas.ShopDocumentRow(
-            id=row.id,
-            type="return_from_shop",
-            date=row.created_at,
-            amount=_to_decimal(row.amount),
-            manager_name=(row.full_name or row.username or ""),
-        )
-        for row in returns_rows
-    ]
+    returns_from_shop = schemas.ShopDocumentRowList.validate_python(
+        [
+            {
+                "id": row.id,
+                "type": "return_from_shop",
+                "date": row.created_at,
+                "amount": _to_decimal(row.amount),
+                "manager_name": (row.full_name or row.username or ""),
+            }
+            for row in returns_rows
+        ]
+    )
 
     bonuses_rows = (
         db.query(
@@ -2619,16 +3074,18 @@ def get_admin_shop_period_report(
         .all()
     )
 
-    bonuses = [
-        schemas.ShopDocumentRow(
-            id=row.id,
-            type="bonus",
-            date=row.created_at,
-            amount=_to_decimal(row.amount),
-            manager_name=(row.full_name or row.username or ""),
-        )
-        for row in bonuses_rows
-    ]
+    bonuses = schemas.ShopDocumentRowList.validate_python(
+        [
+            {
+                "id": row.id,
+                "type": "bonus",
+                "date": row.created_at,
+                "amount": _to_decimal(row.amount),
+                "manager_name": (row.full_name or row.username or ""),
+            }
+            for row in bonuses_rows
+        ]
+    )
 
     summary = schemas.AdminShopPeriodSummary(
         issued_total=_to_decimal(issued_total_raw),
@@ -2637,47 +3094,61 @@ def get_admin_shop_period_report(
         debt_total=_to_decimal(debt_total_raw),
     )
 
-    return schemas.AdminShopPeriodReport(
-        shop_id=shop.id,
-        shop_name=shop.name,
-        date_from=date_from,
-        date_to=date_to,
-        summary=summary,
-        days=days,
-        deliveries=deliveries,
-        returns_from_shop=returns_from_shop,
-        bonuses=bonuses,
+    return _model_response(
+        schemas.AdminShopPeriodReport(
+            shop_id=shop.id,
+            shop_name=shop.name,
+            date_from=date_from,
+            date_to=date_to,
+            summary=summary,
+            days=days,
+            deliveries=deliveries,
+            returns_from_shop=returns_from_shop,
+            bonuses=bonuses,
+        )
     )
 
 
+def _load_product_names(db: Session, product_ids: Sequence[int]) -> Dict[int, str]:
+    if not product_ids:
+        return {}
+    rows = db.execute(
+        select(models.Product.id, models.Product.name).where(models.Product.id.in_(set(product_ids)))
+    ).all()
+    return {row.id: row.name for row in rows}
+
+
 # Reports endpoints
 @app.get("/reports/products")
 def get_product_report(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    total_products = db.query(models.Product).filter(
-        models.Product.manager_id.is_(None),
-        models.Product.is_return == False
-    ).count()
+    total_products = db.execute(
+        select(func.count(models.Product.id)).where(
+            models.Product.manager_id.is_(None),
+            models.Product.is_return == False,
+        )
+    ).scalar_one()
     
     total_returns = db.execute(
         text("SELECT COALESCE(SUM(quantity), 0) AS total FROM return_items")
     ).scalar() or 0
     
-    dispatch_query = db.query(models.Dispatch).filter(text("COALESCE(dispatches.status, 'pending') = 'sent'"))
+    dispatch_query = select(func.coalesce(func.sum(models.Dispatch.quantity), 0)).where(
+        text("COALESCE(dispatches.status, 'pending') = 'sent'")
+    )
     if start_date:
-        dispatch_query = dispatch_query.filter(models.Dispatch.created_at >= start_date)
+        dispatch_query = dispatch_query.where(models.Dispatch.created_at >= start_date)
     if end_date:
-        dispatch_query = dispatch_query.filter(models.Dispatch.created_at <= end_date)
-    
-    dispatches = dispatch_query.all()
-    total_dispatched = sum(d.quantity for d in dispatches)
+        dispatch_query = dispatch_query.where(models.Dispatch.created_at <= end_date)
+
+    total_dispatched = db.execute(dispatch_query).scalar_one()
     
     return {
         "total_products": total_products,
@@ -2690,14 +3161,25 @@ def get_manager_report(
     manager_id: int,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    # Product names come from one batched lookup below, shared with the return rows
     dispatch_query = (
         db.query(models.Dispatch)
+        .options(
+            load_only(
+                models.Dispatch.id,
+                models.Dispatch.product_id,
+                models.Dispatch.quantity,
+                models.Dispatch.price,
+                models.Dispatch.created_at,
+            ),
+            raiseload("*"),
+        )
         .filter(models.Dispatch.manager_id == manager_id)
         .filter(text("COALESCE(dispatches.status, 'pending') = 'sent'"))
     )
@@ -2729,27 +3211,29 @@ def get_manager_report(
     dispatches = dispatch_query.all()
     orders = order_query.all()
     
+    product_names = _load_product_names(
+        db, [d.product_id for d in dispatches] + [row["product_id"] for row in returns_rows]
+    )
+
     # Get product names for dispatches
     dispatches_with_names = []
     for d in dispatches:
-        product = db.query(models.Product).filter(models.Product.id == d.product_id).first()
         dispatches_with_names.append({
             "id": d.id,
             "quantity": d.quantity,
             "price": d.price,
             "created_at": d.created_at,
-            "product_name": product.name if product else "Unknown"
+            "product_name": product_names.get(d.product_id, "Unknown")
         })
     
     returns_with_products = []
     for row in returns_rows:
-        product = db.query(models.Product).filter(models.Product.id == row["product_id"]).first()
         returns_with_products.append(
             {
                 "product_id": row["product_id"],
                 "quantity": row["quantity"],
                 "created_at": row["created_at"],
-                "product_name": product.name if product else "Unknown",
+                "product_name": product_names.get(row["product_id"], "Unknown"),
             }
         )
 
@@ -2767,7 +3251,7 @@ def get_manager_report(
 def get_manager_summary_report(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_full),
     db: Session = Depends(get_db)
 ):
     if current_user.role == "admin":
@@ -2827,7 +3311,7 @@ def get_returns_report(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     manager_id: Optional[int] = None,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "admin":
@@ -2861,18 +3345,17 @@ def get_returns_report(
     base_query += " ORDER BY r.created_at DESC, r.id DESC, ri.id"
 
     returns = db.execute(text(base_query), params).mappings().all()
+    product_names = _load_product_names(db, [return_item["product_id"] for return_item in returns])
     result = []
     
     for return_item in returns:
-        product = db.query(models.Product).filter(models.Product.id == return_item["product_id"]).first()
-
         result.append({
             "id": return_item["id"],
             "created_at": return_item["created_at"].isoformat() if return_item["created_at"] else None,
             "manager_name": return_item["manager_name"],
             "manager_username": return_item["manager_username"],
             "shop_name": None,
-            "product_name": product.name if product else "Unknown",
+            "product_name": product_names.get(return_item["product_id"], "Unknown"),
             "quantity": return_item["quantity"],
         })
     
@@ -2881,18 +3364,20 @@ def get_returns_report(
 @app.post("/shop-orders", response_model=schemas.ShopOrderOut)
 def create_shop_order(
     order: schemas.ShopOrderCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_full),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "manager":
         raise HTTPException(status_code=403, detail="Недостаточно прав")
 
+    # The shop row is locked first (before stock rows) so concurrent orders cannot overwrite each other's debt
     shop = (
         db.query(models.Shop)
         .filter(
             models.Shop.id == order.shop_id,
             models.Shop.manager_id == current_user.id,
         )
+        .with_for_update()
         .first()
     )
     if not shop:
@@ -2908,8 +3393,7 @@ def create_shop_order(
     return_items: List[Dict[str, Any]] = []
 
     for item in order.items:
-        quantity_decimal = Decimal(str(item.quantity))
-        quantity_value = int(quantity_decimal)
+        quantity_value = _whole_quantity(item.quantity)
         if quantity_value <= 0:
             raise HTTPException(status_code=400, detail="Количество должно быть больше нуля")
 
@@ -2926,7 +3410,7 @@ def create_shop_order(
 
         item_data = {
             "product_id": item.product_id,
-            "quantity": quantity_decimal,
+            "quantity": quantity_value,
             "price": price_value,
             "is_bonus": bool(getattr(item, "is_bonus", False)),
             "is_return": bool(getattr(item, "is_return", False)),
@@ -2953,7 +3437,7 @@ def create_shop_order(
     if archived_column is not None:
         products_query = products_query.filter(archived_column.is_(False))
 
-    manager_products = products_query.with_for_update().all()
+    manager_products = products_query.order_by(models.Product.id).with_for_update().all()
     manager_map = {product.id: product for product in manager_products}
 
     missing_ids = [str(pid) for pid in product_ids_list if pid not in manager_map]
@@ -2986,16 +3470,19 @@ def create_shop_order(
         raise HTTPException(status_code=400, detail="Оплата не может быть отрицательной")
 
     old_debt = Decimal(str(shop.debt or 0))
+    manager_name = current_user.full_name or current_user.username
 
     now = datetime.now(timezone.utc)
-    total_goods_amount = Decimal("0")
-    total_bonus_amount = Decimal("0")
-    returns_amount = Decimal("0")
+    total_goods_amount = ZERO
+    total_bonus_amount = ZERO
+    returns_amount = ZERO
 
     try:
         order_row = models.ShopOrder(
             manager_id=current_user.id,
+            manager_name=manager_name,
             shop_id=shop.id,
+            shop_name=shop.name,
             created_at=now,
         )
         db.add(order_row)
@@ -3005,6 +3492,7 @@ def create_shop_order(
             product = manager_map[product_id]
             product.quantity = (product.quantity or 0) - requested
 
+        order_item_rows: List[Dict[str, Any]] = []
         for item_data in normal_items + bonus_items + return_items:
             product = manager_map[item_data["product_id"]]
             fallback_price = Decimal(str(product.price or 0))
@@ -3012,7 +3500,7 @@ def create_shop_order(
             if price_decimal < 0:
                 raise HTTPException(status_code=400, detail="Цена не может быть отрицательной")
 
-            line_total = Decimal(str(item_data["quantity"])) * price_decimal
+            line_total = item_data["quantity"] * price_decimal
             if item_data["is_return"]:
                 returns_amount += line_total
             elif item_data["is_bonus"]:
@@ -3020,20 +3508,34 @@ def create_shop_order(
             else:
                 total_goods_amount += line_total
 
-            db.add(
-                models.ShopOrderItem(
-                    order_id=order_row.id,
-                    product_id=item_data["product_id"],
-                    quantity=item_data["quantity"],
-                    price=price_decimal,
-                    is_bonus=item_data["is_bonus"],
-                    is_return=item_data["is_return"],
-                )
+            order_item_rows.append(
+                {
+                    "order_id": order_row.id,
+                    "product_id": item_data["product_id"],
+                    "product_name": product.name,
+                    "quantity": item_data["quantity"],
+                    "price": price_decimal,
+                    "is_bonus": item_data["is_bonus"],
+                    "is_return": item_data["is_return"],
+                }
             )
 
+        db.execute(insert(models.ShopOrderItem), order_item_rows)
+        order_row.items_cache = [
+            {
+                "product_id": row["product_id"],
+                "product_name": row["product_name"] or "",
+                "quantity": row["quantity"],
+                "price": float(row["price"].quantize(Decimal("0.01"))),
+                "is_bonus": bool(row["is_bonus"]),
+                "is_return": bool(row["is_return"]),
+            }
+            for row in order_item_rows
+        ]
+
         payable_amount = total_goods_amount - returns_amount
         if payable_amount < 0:
-            payable_amount = Decimal("0")
+            payable_amount = ZERO
 
         order_total = total_goods_amount
         max_allowed_payment = payable_amount + old_debt
@@ -3050,33 +3552,39 @@ def create_shop_order(
             debt_amount = payable_amount - paid_amount
         elif abs(paid_amount - payable_amount) <= Decimal("0.000001"):
             new_debt = old_debt
-            debt_amount = Decimal("0")
+            debt_amount = ZERO
         else:
             extra = paid_amount - payable_amount
             new_debt = old_debt - extra
             if new_debt < 0:
-                new_debt = Decimal("0")
-            debt_amount = Decimal("0")
+                new_debt = ZERO
+            debt_amount = ZERO
 
         shop.debt = float(new_debt)
 
         if return_items:
             shop_return = models.ShopReturn(
                 manager_id=current_user.id,
+                manager_name=manager_name,
                 shop_id=shop.id,
+                shop_name=shop.name,
                 created_at=now,
             )
             db.add(shop_return)
             db.flush()
 
-            for item_data in return_items:
-                db.add(
-                    models.ShopReturnItem(
-                        return_id=shop_return.id,
-                        product_id=item_data["product_id"],
-                        quantity=item_data["quantity"],
-                    )
-                )
+            db.execute(
+                insert(models.ShopReturnItem),
+                [
+                    {
+                        "return_id": shop_return.id,
+                        "product_id": item_data["product_id"],
+                        "product_name": manager_map[item_data["product_id"]].name,
+                        "quantity": item_data["quantity"],
+                    }
+                    for item_data in return_items
+                ],
+            )
 
         db.add(
             models.ShopOrderPayment(
@@ -3120,7 +3628,7 @@ def create_shop_order(
 @app.get("/shop-orders/{order_id}", response_model=schemas.ShopOrderDetail)
 def get_shop_order_detail(
     order_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role not in ("admin", "manager"):
@@ -3129,9 +3637,9 @@ def get_shop_order_detail(
     order = (
         db.query(models.ShopOrder)
         .options(
-            joinedload(models.ShopOrder.items).joinedload(models.ShopOrderItem.product),
-            joinedload(models.ShopOrder.shop),
-            joinedload(models.ShopOrder.manager),
+            selectinload(models.ShopOrder.items),
+            joinedload(models.ShopOrder.payment),
+            raiseload("*"),
         )
         .filter(models.ShopOrder.id == order_id)
         .first()
@@ -3144,90 +3652,74 @@ def get_shop_order_detail(
         raise HTTPException(status_code=403, detail="Недостаточно прав для просмотра заказа")
 
     sorted_items = sorted(order.items, key=lambda item: item.id)
-    total_goods_amount = Decimal("0")
-    total_bonus_amount = Decimal("0")
-    total_return_amount = Decimal("0")
     items: List[Dict[str, Any]] = []
 
     for item in sorted_items:
         quantity_decimal = Decimal(str(item.quantity))
         price_decimal = Decimal(str(item.price or 0))
-        line_total = quantity_decimal * price_decimal
-
-        if getattr(item, "is_return", False):
-            total_return_amount += line_total
-        elif item.is_bonus:
-            total_bonus_amount += line_total
-        else:
-            total_goods_amount += line_total
 
         items.append(
             {
-                "product_name": item.product.name if item.product else "",
+                "product_name": item.product_name or "",
                 "quantity": quantity_decimal,
                 "price": price_decimal,
-                "line_total": line_total,
+                "line_total": quantity_decimal * price_decimal,
                 "is_bonus": bool(item.is_bonus),
                 "is_return": bool(getattr(item, "is_return", False)),
             }
         )
 
-    manager_name = ""
-    if order.manager:
-        manager_name = order.manager.full_name or order.manager.username or ""
-
-    total_amount = total_goods_amount
-    returns_amount = total_return_amount
-    payable_amount = total_amount - returns_amount
-    if payable_amount < 0:
-        payable_amount = Decimal("0")
-
-    paid_amount = Decimal("0")
-    debt_amount = payable_amount
-
     if order.payment:
-        total_amount = _to_decimal(order.payment.total_amount)
-        returns_amount = _to_decimal(order.payment.returns_amount)
-        payable_amount = _to_decimal(order.payment.payable_amount)
-        paid_amount = _to_decimal(order.payment.paid_amount)
-        debt_amount = _to_decimal(order.payment.debt_amount)
-
-    payment_data = schemas.ShopOrderPaymentDetail(
-        total_amount=total_amount,
-        returns_amount=returns_amount,
-        payable_amount=payable_amount,
-        paid_amount=paid_amount,
-        debt_amount=debt_amount,
-    )
+        payment_data = schemas.ShopOrderPaymentDetail(
+            total_amount=_to_decimal(order.payment.total_amount),
+            returns_amount=_to_decimal(order.payment.returns_amount),
+            payable_amount=_to_decimal(order.payment.payable_amount),
+            paid_amount=_to_decimal(order.payment.paid_amount),
+            debt_amount=_to_decimal(order.payment.debt_amount),
+        )
+    else:
+        # Orders saved before payments were recorded: rebuild the payment from the items
+        total_amount = sum(
+            (row["line_total"] for row in items if not row["is_return"] and not row["is_bonus"]),
+            ZERO,
+        )
+        returns_amount = sum((row["line_total"] for row in items if row["is_return"]), ZERO)
+        payable_amount = max(total_amount - returns_amount, ZERO)
+        payment_data = schemas.ShopOrderPaymentDetail(
+            total_amount=total_amount,
+            returns_amount=returns_amount,
+            payable_amount=payable_amount,
+            paid_amount=ZERO,
+            debt_amount=payable_amount,
+        )
 
-    return schemas.ShopOrderDetail(
-        id=order.id,
-        manager_name=manager_name,
-        shop_name=order.shop.name if order.shop else "",
-        created_at=order.created_at,
-        items=items,
-        payment=payment_data,
-        total_goods_amount=total_goods_amount,
-        total_bonus_amount=total_bonus_amount,
-        total_return_amount=total_return_amount,
+    return _model_response(
+        schemas.ShopOrderDetail(
+            id=order.id,
+            manager_name=order.manager_name or "",
+            shop_name=order.shop_name or "",
+            created_at=order.created_at,
+            items=items,
+            payment=payment_data,
+        )
     )
 
 
 @app.get("/shop-orders", response_model=List[schemas.ShopOrderOut])
 def list_shop_orders(
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "manager":
         raise HTTPException(status_code=403, detail="Недостаточно прав")
 
-    return _fetch_shop_orders(db, manager_id=current_user.id)
+    return _list_response(schemas.ShopOrderOutList, _fetch_shop_orders(db, manager_id=current_user.id))
 
 
 @app.post("/shop-returns", response_model=schemas.ShopReturnOut)
 def create_shop_return(
     payload: schemas.ShopReturnCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_full),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "manager":
@@ -3249,7 +3741,7 @@ def create_shop_return(
 
     aggregated: Dict[int, int] = {}
     for item in payload.items:
-        quantity_value = int(item.quantity)
+        quantity_value = _whole_quantity(item.quantity)
         if quantity_value <= 0:
             raise HTTPException(status_code=400, detail="Количество должно быть больше нуля")
         aggregated[item.product_id] = aggregated.get(item.product_id, 0) + quantity_value
@@ -3278,20 +3770,26 @@ def create_shop_return(
     try:
         return_row = models.ShopReturn(
             manager_id=current_user.id,
+            manager_name=current_user.full_name or current_user.username,
             shop_id=shop.id,
+            shop_name=shop.name,
             created_at=datetime.now(timezone.utc),
         )
         db.add(return_row)
         db.flush()
 
-        for product_id, quantity in aggregated.items():
-            db.add(
-                models.ShopReturnItem(
-                    return_id=return_row.id,
-                    product_id=product_id,
-                    quantity=quantity,
-                )
-            )
+        db.execute(
+            insert(models.ShopReturnItem),
+            [
+                {
+                    "return_id": return_row.id,
+                    "product_id": product_id,
+                    "product_name": manager_map[product_id].name,
+                    "quantity": quantity,
+                }
+                for product_id, quantity in aggregated.items()
+            ],
+        )
 
         db.commit()
     except HTTPException:
@@ -3311,7 +3809,7 @@ def create_shop_return(
 @app.get("/shop-returns/{return_id}", response_model=schemas.ShopReturnDetail)
 def get_shop_return_detail(
     return_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role not in ("admin", "manager"):
@@ -3320,9 +3818,8 @@ def get_shop_return_detail(
     return_doc = (
         db.query(models.ShopReturn)
         .options(
-            joinedload(models.ShopReturn.items).joinedload(models.ShopReturnItem.product),
-            joinedload(models.ShopReturn.shop),
-            joinedload(models.ShopReturn.manager),
+            selectinload(models.ShopReturn.items).joinedload(models.ShopReturnItem.product),
+            raiseload("*"),
         )
         .filter(models.ShopReturn.id == return_id)
         .first()
@@ -3336,8 +3833,8 @@ def get_shop_return_detail(
 
     sorted_items = sorted(return_doc.items, key=lambda item: item.id)
     items: List[Dict[str, Any]] = []
-    total_amount = Decimal("0")
-    total_quantity = Decimal("0")
+    total_amount = ZERO
+    total_quantity = ZERO
     for item in sorted_items:
         quantity_decimal = Decimal(str(item.quantity))
         price_decimal = Decimal(str(getattr(item, "price_at_time", None) or getattr(item.product, "price", 0) or 0))
@@ -3347,23 +3844,19 @@ def get_shop_return_detail(
         items.append(
             {
                 "product_id": item.product_id,
-                "product_name": item.product.name if item.product else "",
+                "product_name": item.product_name or "",
                 "quantity": quantity_decimal,
                 "price": price_decimal,
                 "line_total": line_total,
             }
         )
 
-    manager_name = ""
-    if return_doc.manager:
-        manager_name = return_doc.manager.full_name or return_doc.manager.username or ""
-
     return schemas.ShopReturnDetail(
         id=return_doc.id,
         manager_id=return_doc.manager_id,
-        manager_name=manager_name,
+        manager_name=return_doc.manager_name or "",
         shop_id=return_doc.shop_id,
-        shop_name=return_doc.shop.name if return_doc.shop else "",
+        shop_name=return_doc.shop_name or "",
         created_at=return_doc.created_at,
         total_quantity=total_quantity,
         total_amount=total_amount,
@@ -3374,15 +3867,15 @@ def get_shop_return_detail(
 @app.get("/shop-returns", response_model=List[schemas.ShopReturnOut])
 def list_shop_returns(
     manager_id: Optional[int] = Query(None),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role == "manager":
-        return _fetch_shop_returns(db, manager_id=current_user.id)
+        return _list_response(schemas.ShopReturnOutList, _fetch_shop_returns(db, manager_id=current_user.id))
 
     if current_user.role == "admin":
         target_manager_id = manager_id if manager_id is not None else None
-        return _fetch_shop_returns(db, manager_id=target_manager_id)
+        return _list_response(schemas.ShopReturnOutList, _fetch_shop_returns(db, manager_id=target_manager_id))
 
     raise HTTPException(status_code=403, detail="Недостаточно прав")
 
@@ -3390,7 +3883,7 @@ def list_shop_returns(
 @app.post("/manager-returns", response_model=schemas.ManagerReturnCreated)
 def create_manager_return(
     payload: schemas.ManagerReturnCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: models.User = Depends(get_current_user_full),
     db: Session = Depends(get_db),
 ):
     if current_user.role != "manager":
@@ -3401,7 +3894,7 @@ def create_manager_return(
 
     aggregated: Dict[int, int] = {}
     for item in payload.items:
-        quantity_value = int(item.quantity)
+        quantity_value = _whole_quantity(item.quantity)
         if quantity_value <= 0:
             raise HTTPException(status_code=400, detail="Количество должно быть больше нуля")
         aggregated[item.product_id] = aggregated.get(item.product_id, 0) + quantity_value
@@ -3417,7 +3910,7 @@ def create_manager_return(
     if archived_column is not None:
         products_query = products_query.filter(archived_column.is_(False))
 
-    manager_products = products_query.with_for_update().all()
+    manager_products = products_query.order_by(models.Product.id).with_for_update().all()
     manager_map = {product.id: product for product in manager_products}
 
     missing_ids = [str(pid) for pid in product_ids if pid not in manager_map]
@@ -3454,7 +3947,7 @@ def create_manager_return(
     if archived_column is not None:
         base_query = base_query.filter(archived_column.is_(False))
 
-    base_products = base_query.with_for_update().all()
+    base_products = base_query.order_by(models.Product.id).with_for_update().all()
     base_map = {product.name: product for product in base_products}
 
     missing_base = [name for name in product_names if name not in base_map]
@@ -3469,11 +3962,13 @@ def create_manager_return(
     try:
         return_row = models.ManagerReturn(
             manager_id=current_user.id,
+            manager_name=current_user.full_name or current_user.username,
             created_at=now,
         )
         db.add(return_row)
         db.flush()
 
+        item_rows: List[Dict[str, Any]] = []
         for product_id, quantity in aggregated.items():
             manager_product = manager_map[product_id]
             base_product = base_map[manager_product.name]
@@ -3481,14 +3976,17 @@ def create_manager_return(
             manager_product.quantity = (manager_product.quantity or 0) - quantity
             base_product.quantity = (base_product.quantity or 0) + quantity
 
-            db.add(
-                models.ManagerReturnItem(
-                    return_id=return_row.id,
-                    product_id=base_product.id,
-                    quantity=quantity,
-                )
+            item_rows.append(
+                {
+                    "return_id": return_row.id,
+                    "product_id": base_product.id,
+                    "product_name": base_product.name,
+                    "quantity": quantity,
+                }
             )
 
+        db.execute(insert(models.ManagerReturnItem), item_rows)
+
         db.commit()
     except HTTPException:
         db.rollback()
@@ -3503,7 +4001,7 @@ def create_manager_return(
 @app.get("/manager-returns/{return_id}", response_model=schemas.ManagerReturnDetail)
 def get_manager_return_detail(
     return_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role not in ("admin", "manager"):
@@ -3512,8 +4010,8 @@ def get_manager_return_detail(
     return_doc = (
         db.query(models.ManagerReturn)
         .options(
-            joinedload(models.ManagerReturn.items).joinedload(models.ManagerReturnItem.product),
-            joinedload(models.ManagerReturn.manager),
+            selectinload(models.ManagerReturn.items).joinedload(models.ManagerReturnItem.product),
+            raiseload("*"),
         )
         .filter(models.ManagerReturn.id == return_id)
         .first()
@@ -3527,7 +4025,7 @@ def get_manager_return_detail(
 
     sorted_items = sorted(return_doc.items, key=lambda item: item.id)
     items: List[Dict[str, Any]] = []
-    total_amount = Decimal("0")
+    total_amount = ZERO
     for item in sorted_items:
         quantity_decimal = Decimal(str(item.quantity))
         price_decimal = Decimal(str(getattr(item, "price_at_time", None) or getattr(item.product, "price", 0) or 0))
@@ -3536,21 +4034,17 @@ def get_manager_return_detail(
         items.append(
             {
                 "product_id": item.product_id,
-                "product_name": item.product.name if item.product else "",
+                "product_name": item.product_name or "",
                 "quantity": quantity_decimal,
                 "price": price_decimal,
                 "line_total": line_total,
             }
         )
 
-    manager_name = ""
-    if return_doc.manager:
-        manager_name = return_doc.manager.full_name or return_doc.manager.username or ""
-
     return schemas.ManagerReturnDetail(
         id=return_doc.id,
         manager_id=return_doc.manager_id,
-        manager_name=manager_name,
+        manager_name=return_doc.manager_name or "",
         created_at=return_doc.created_at,
         total_amount=total_amount,
         items=items,
@@ -3564,14 +4058,20 @@ def _build_sales_order_item_data(
         raise HTTPException(status_code=400, detail="Добавьте товары")
 
     prepared_items: list[models.SalesOrderItem] = []
-    total_amount = Decimal("0")
+    total_amount = ZERO
+
+    product_rows = db.execute(
+        select(
+            models.Product.id,
+            models.Product.price,
+            models.Product.manager_id,
+            models.Product.is_return,
+        ).where(models.Product.id.in_({item.product_id for item in items}))
+    ).all()
+    product_map = {row.id: row for row in product_rows}
 
     for item in items:
-        product = (
-            db.query(models.Product)
-            .filter(models.Product.id == item.product_id)
-            .first()
-        )
+        product = product_map.get(item.product_id)
         if not product:
             raise HTTPException(status_code=404, detail="Товар не найден")
         if product.manager_id is not None or product.is_return:
@@ -3596,20 +4096,21 @@ def _build_sales_order_item_data(
 
 
 def _serialize_sales_order(order: models.SalesOrder) -> schemas.SalesOrderOut:
-    items = []
-    for item in order.items:
-        items.append(
-            schemas.SalesOrderItemOut(
-                product_id=item.product_id,
-                product_name=item.product.name if item.product else "",
-                quantity=float(item.quantity),
-                price_at_time=float(item.price_at_time),
-                line_total=float(item.line_total),
-            )
+    # Values come straight from the database, so skip re-validation here;
+    # FastAPI validates the response model once on the way out.
+    items = [
+        schemas.SalesOrderItemOut.model_construct(
+            product_id=item.product_id,
+            product_name=item.product.name if item.product else "",
+            quantity=float(item.quantity),
+            price_at_time=float(item.price_at_time),
+            line_total=float(item.line_total),
         )
+        for item in order.items
+    ]
 
     counterparty = order.counterparty
-    counterparty_data = schemas.SalesOrderCounterpartyOut(
+    counterparty_data = schemas.SalesOrderCounterpartyOut.model_construct(
         id=counterparty.id,
         name=counterparty.name,
         company_name=counterparty.company_name,
@@ -3618,7 +4119,7 @@ def _serialize_sales_order(order: models.SalesOrder) -> schemas.SalesOrderOut:
         address=counterparty.address,
     )
 
-    return schemas.SalesOrderOut(
+    return schemas.SalesOrderOut.model_construct(
         id=order.id,
         counterparty=counterparty_data,
         status=order.status,
@@ -3634,7 +4135,7 @@ def _serialize_sales_order(order: models.SalesOrder) -> schemas.SalesOrderOut:
 
 def _serialize_counterparty_sale(sale: models.CounterpartySale) -> schemas.CounterpartySaleOut:
     items = [
-        schemas.CounterpartySaleItemOut(
+        schemas.CounterpartySaleItemOut.model_construct(
             product_id=item.product_id,
             product_name=item.product.name if item.product else "",
             quantity=float(item.quantity),
@@ -3645,7 +4146,7 @@ def _serialize_counterparty_sale(sale: models.CounterpartySale) -> schemas.Count
     ]
 
     counterparty = sale.counterparty
-    counterparty_data = schemas.CounterpartyShortOut(
+    counterparty_data = schemas.CounterpartyShortOut.model_construct(
         id=counterparty.id,
         name=counterparty.name,
         company=counterparty.company,
@@ -3653,7 +4154,7 @@ def _serialize_counterparty_sale(sale: models.CounterpartySale) -> schemas.Count
         address=counterparty.address,
     )
 
-    return schemas.CounterpartySaleOut(
+    return schemas.CounterpartySaleOut.model_construct(
         id=sale.id,
         counterparty=counterparty_data,
         created_at=sale.created_at,
@@ -3765,7 +4266,7 @@ def _build_counterparty_sale_print_html(sale: models.CounterpartySale, include_a
 @app.get("/admin/counterparties", response_model=List[schemas.CounterpartyOut])
 def list_counterparties(
     search: Optional[str] = Query(None),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -3788,7 +4289,7 @@ def list_counterparties(
 @app.post("/admin/counterparties", response_model=schemas.CounterpartyOut)
 def create_counterparty(
     payload: schemas.CounterpartyCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -3811,7 +4312,7 @@ def create_counterparty(
 def update_counterparty(
     counterparty_id: int,
     payload: schemas.CounterpartyUpdate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -3820,7 +4321,7 @@ def update_counterparty(
     if not counterparty:
         raise HTTPException(status_code=404, detail="Контрагент не найден")
 
-    update_data = payload.dict(exclude_unset=True)
+    update_data = payload.model_dump(exclude_unset=True)
     if "company" in update_data:
         update_data["company_name"] = update_data.pop("company")
     for key, value in update_data.items():
@@ -3834,7 +4335,7 @@ def update_counterparty(
 @app.delete("/admin/counterparties/{counterparty_id}")
 def archive_counterparty(
     counterparty_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -3852,7 +4353,7 @@ def archive_counterparty(
 def pay_counterparty_debt(
     counterparty_id: int,
     payload: schemas.CounterpartyDebtPaymentCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -3860,6 +4361,7 @@ def pay_counterparty_debt(
     counterparty = (
         db.query(models.Counterparty)
         .filter(models.Counterparty.id == counterparty_id, models.Counterparty.is_archived.is_(False))
+        .with_for_update()
         .first()
     )
     if not counterparty:
@@ -3896,12 +4398,29 @@ def list_counterparty_sales(
     counterparty_id: Optional[int] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
 
-    query = db.query(models.CounterpartySale).options(joinedload(models.CounterpartySale.counterparty))
+    query = db.query(models.CounterpartySale).options(
+        load_only(
+            models.CounterpartySale.id,
+            models.CounterpartySale.counterparty_id,
+            models.CounterpartySale.created_at,
+            models.CounterpartySale.total_amount,
+            models.CounterpartySale.paid_total,
+            models.CounterpartySale.new_debt_added,
+            models.CounterpartySale.debt_after,
+        ),
+        joinedload(models.CounterpartySale.counterparty).load_only(
+            models.Counterparty.name,
+            models.Counterparty.company,
+            models.Counterparty.phone,
+            models.Counterparty.address,
+        ),
+        raiseload("*"),
+    )
 
     if counterparty_id:
         query = query.filter(models.CounterpartySale.counterparty_id == counterparty_id)
@@ -3913,34 +4432,30 @@ def list_counterparty_sales(
         query = query.filter(models.CounterpartySale.created_at <= end_dt)
 
     sales = query.order_by(models.CounterpartySale.created_at.desc()).all()
-    results: list[schemas.CounterpartySaleListItem] = []
-    for sale in sales:
-        counterparty = sale.counterparty
-        counterparty_data = schemas.CounterpartyShortOut(
-            id=counterparty.id,
-            name=counterparty.name,
-            company=counterparty.company,
-            phone=counterparty.phone,
-            address=counterparty.address,
-        )
-        results.append(
-            schemas.CounterpartySaleListItem(
-                id=sale.id,
-                counterparty=counterparty_data,
-                created_at=sale.created_at,
-                total_amount=float(sale.total_amount),
-                paid_total=float(sale.paid_total),
-                new_debt_added=float(sale.new_debt_added),
-                debt_after=float(sale.debt_after),
-            )
+    return [
+        schemas.CounterpartySaleListItem.model_construct(
+            id=sale.id,
+            counterparty=schemas.CounterpartyShortOut.model_construct(
+                id=sale.counterparty.id,
+                name=sale.counterparty.name,
+                company=sale.counterparty.company,
+                phone=sale.counterparty.phone,
+                address=sale.counterparty.address,
+            ),
+            created_at=sale.created_at,
+            total_amount=float(sale.total_amount),
+            paid_total=float(sale.paid_total),
+            new_debt_added=float(sale.new_debt_added),
+            debt_after=float(sale.debt_after),
         )
-    return results
+        for sale in sales
+    ]
 
 
 @app.get("/admin/counterparty-sales/{sale_id}", response_model=schemas.CounterpartySaleOut)
 def get_counterparty_sale(
     sale_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -3960,7 +4475,7 @@ def get_counterparty_sale(
 @app.post("/admin/counterparty-sales", response_model=schemas.CounterpartySaleOut)
 def create_counterparty_sale(
     payload: schemas.CounterpartySaleCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -3968,9 +4483,11 @@ def create_counterparty_sale(
     if not payload.items:
         raise HTTPException(status_code=400, detail="Добавьте товары")
 
+    # Lock the counterparty before the product rows; its debt is recomputed from the locked value
     counterparty = (
         db.query(models.Counterparty)
         .filter(models.Counterparty.id == payload.counterparty_id, models.Counterparty.is_archived.is_(False))
+        .with_for_update()
         .first()
     )
     if not counterparty:
@@ -3990,6 +4507,7 @@ def create_counterparty_sale(
     products = (
         db.query(models.Product)
         .filter(models.Product.id.in_(product_ids))
+        .order_by(models.Product.id)
         .with_for_update()
         .all()
     )
@@ -3998,7 +4516,7 @@ def create_counterparty_sale(
     if missing_ids:
         raise HTTPException(status_code=404, detail=f"Товары не найдены: {', '.join(missing_ids)}")
 
-    total_amount = Decimal("0")
+    total_amount = ZERO
     sale_items: list[models.CounterpartySaleItem] = []
 
     for item in payload.items:
@@ -4039,7 +4557,7 @@ def create_counterparty_sale(
             detail="Сумма оплаты превышает сумму продажи + текущий долг",
         )
     debt_after = total_due - paid_sum
-    new_debt_added = max(total_amount - paid_sum, Decimal("0"))
+    new_debt_added = max(total_amount - paid_sum, ZERO)
     counterparty.debt = float(debt_after)
 
     sale = models.CounterpartySale(
@@ -4067,7 +4585,7 @@ def create_counterparty_sale(
 @app.get("/admin/counterparty-sales/{sale_id}/print")
 def print_counterparty_sale(
     sale_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4089,7 +4607,7 @@ def print_counterparty_sale(
 @app.get("/admin/counterparty-sales/{sale_id}/print-html")
 def print_counterparty_sale_html(
     sale_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4114,12 +4632,27 @@ def list_sales_orders(
     counterparty_id: Optional[int] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
 
-    query = db.query(models.SalesOrder).join(models.Counterparty)
+    query = (
+        db.query(models.SalesOrder)
+        .join(models.SalesOrder.counterparty)
+        .options(
+            load_only(
+                models.SalesOrder.id,
+                models.SalesOrder.counterparty_id,
+                models.SalesOrder.created_at,
+                models.SalesOrder.status,
+                models.SalesOrder.total_amount,
+            ),
+            # Reuse the filter join for the counterparty name instead of a second eager join
+            contains_eager(models.SalesOrder.counterparty).load_only(models.Counterparty.name),
+            raiseload("*"),
+        )
+    )
 
     if status:
         query = query.filter(models.SalesOrder.status == status)
@@ -4152,7 +4685,7 @@ def list_sales_orders(
 @app.get("/admin/sales-orders/{order_id}", response_model=schemas.SalesOrderOut)
 def get_sales_order(
     order_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4173,7 +4706,7 @@ def get_sales_order(
 @app.post("/admin/sales-orders", response_model=schemas.SalesOrderOut)
 def create_sales_order(
     payload: schemas.SalesOrderCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4207,7 +4740,7 @@ def create_sales_order(
 def update_sales_order(
     order_id: int,
     payload: schemas.SalesOrderUpdate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4248,7 +4781,7 @@ def update_sales_order(
 def close_sales_order(
     order_id: int,
     payload: schemas.SalesOrderClose,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4268,7 +4801,7 @@ def close_sales_order(
     if not order.items:
         raise HTTPException(status_code=400, detail="Добавьте товары")
 
-    total_amount = Decimal("0")
+    total_amount = ZERO
     for item in order.items:
         quantity_decimal = Decimal(str(item.quantity))
         price_decimal = Decimal(str(item.price_at_time))
@@ -4311,7 +4844,7 @@ def close_sales_order(
 @app.get("/admin/sales-orders/{order_id}/print")
 def print_sales_order(
     order_id: int,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4415,7 +4948,7 @@ def counterparty_sales_report(
     driver_id: Optional[int] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4496,7 +5029,7 @@ def counterparty_sales_report(
 
 @app.get("/admin/warehouse-settings", response_model=schemas.WarehouseSettingsOut)
 def get_warehouse_settings(
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4519,7 +5052,7 @@ def get_warehouse_settings(
 @app.put("/admin/warehouse-settings", response_model=schemas.WarehouseSettingsOut)
 def update_warehouse_settings(
     payload: schemas.WarehouseSettingsBase,
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4529,7 +5062,7 @@ def update_warehouse_settings(
         settings = models.WarehouseSettings()
         db.add(settings)
 
-    update_data = payload.dict(exclude_unset=True)
+    update_data = payload.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(settings, key, value)
 
@@ -4544,7 +5077,7 @@ def counterparty_report(
     counterparty_id: Optional[int] = Query(None),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4565,9 +5098,9 @@ def counterparty_report(
         query = query.filter(models.SalesOrder.closed_at <= end_dt)
 
     orders = query.order_by(models.SalesOrder.closed_at.desc()).all()
-    total_turnover = Decimal("0")
-    total_paid = Decimal("0")
-    total_debt = Decimal("0")
+    total_turnover = ZERO
+    total_paid = ZERO
+    total_debt = ZERO
     rows: list[schemas.CounterpartyReportRow] = []
 
     for order in orders:
@@ -4594,7 +5127,7 @@ def counterparty_report(
 
 @app.get("/admin/counterparty-debts", response_model=List[schemas.CounterpartyDebtItem])
 def counterparty_debts(
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     require_admin(current_user)
@@ -4626,7 +5159,7 @@ def counterparty_debts(
 
 @app.get("/manager-returns", response_model=List[schemas.ManagerReturnOut])
 def list_manager_returns(
-    current_user: models.User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if current_user.role not in ("manager", "admin"):
@@ -4636,7 +5169,7 @@ def list_manager_returns(
     if current_user.role == "manager":
         manager_id = current_user.id
 
-    return _fetch_manager_returns(db, manager_id=manager_id)
+    return _list_response(schemas.ManagerReturnOutList, _fetch_manager_returns(db, manager_id=manager_id))
 
 
 if __name__ == "__main__":
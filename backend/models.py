@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Numeric, Date, Text
-from sqlalchemy.orm import relationship, synonym
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Numeric, Date, Text, Index, JSON, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship, synonym
 from database import Base
-from datetime import datetime, timezone, date
+
+# Money is stored as exact NUMERIC but read back as float so existing arithmetic and JSON stay unchanged
+MONEY = Numeric(14, 2, asdecimal=False)
 
 class User(Base):
     __tablename__ = "users"
@@ -12,7 +15,24 @@ class User(Base):
     role = Column(String)  # 'admin' or 'manager'
     full_name = Column(String)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=func.now())
+
+    products = relationship("Product", back_populates="manager", passive_deletes="all")
+    shops = relationship("Shop", back_populates="manager", passive_deletes="all")
+    created_counterparties = relationship("Counterparty", back_populates="created_by_admin", passive_deletes="all")
+    created_sales_orders = relationship("SalesOrder", back_populates="created_by_admin", passive_deletes="all")
+    created_counterparty_sales = relationship("CounterpartySale", back_populates="created_by_admin", foreign_keys="CounterpartySale.created_by_admin_id", passive_deletes="all")
+    driven_counterparty_sales = relationship("CounterpartySale", back_populates="driver", foreign_keys="CounterpartySale.driver_id", passive_deletes="all")
+    created_counterparty_debt_payments = relationship("CounterpartyDebtPayment", back_populates="created_by_admin", passive_deletes="all")
+    dispatches = relationship("Dispatch", back_populates="manager", passive_deletes="all")
+    orders = relationship("Order", back_populates="manager", passive_deletes="all")
+    returns = relationship("Return", back_populates="manager", passive_deletes="all")
+    created_incomings = relationship("Incoming", back_populates="created_by_admin", passive_deletes="all")
+    shop_orders = relationship("ShopOrder", back_populates="manager", passive_deletes="all")
+    shop_debt_payments = relationship("ShopDebtPayment", back_populates="manager", passive_deletes="all")
+    shop_returns = relationship("ShopReturn", back_populates="manager", passive_deletes="all")
+    manager_returns = relationship("ManagerReturn", back_populates="manager", passive_deletes="all")
+    daily_reports = relationship("DriverDailyReport", back_populates="manager", passive_deletes="all")
 
 class Product(Base):
     __tablename__ = "products"
@@ -20,12 +40,25 @@ class Product(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     quantity = Column(Integer)
-    price = Column(Float)
+    price = Column(MONEY)
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     is_return = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=func.now())
     
-    manager = relationship("User", foreign_keys=[manager_id])
+    manager = relationship("User", foreign_keys=[manager_id], back_populates="products")
+    sales_order_items = relationship("SalesOrderItem", back_populates="product", passive_deletes="all")
+    counterparty_sale_items = relationship("CounterpartySaleItem", back_populates="product", passive_deletes="all")
+    dispatches = relationship("Dispatch", back_populates="product", passive_deletes="all")
+    orders = relationship("Order", back_populates="product", passive_deletes="all")
+    returns = relationship("Return", back_populates="product", passive_deletes="all")
+    incoming_items = relationship("IncomingItem", back_populates="product", passive_deletes="all")
+    shop_order_items = relationship("ShopOrderItem", back_populates="product", passive_deletes="all")
+    shop_return_items = relationship("ShopReturnItem", back_populates="product", passive_deletes="all")
+    manager_return_items = relationship("ManagerReturnItem", back_populates="product", passive_deletes="all")
+
+    __table_args__ = (
+        Index("ix_products_manager_name", "manager_id", "name"),
+    )
 
 class Shop(Base):
     __tablename__ = "shops"
@@ -35,12 +68,21 @@ class Shop(Base):
     address = Column(String)
     phone = Column(String)
     refrigerator_number = Column(String)
-    debt = Column(Float, default=0.0)
+    debt = Column(MONEY, default=0.0)
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     manager_name = Column(String, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=func.now())
+
+    manager = relationship("User", foreign_keys=[manager_id], back_populates="shops")
+    orders = relationship("Order", back_populates="shop", passive_deletes="all")
+    returns = relationship("Return", back_populates="shop", passive_deletes="all")
+    shop_orders = relationship("ShopOrder", back_populates="shop", passive_deletes="all")
+    debt_payments = relationship("ShopDebtPayment", back_populates="shop", passive_deletes="all")
+    shop_returns = relationship("ShopReturn", back_populates="shop", passive_deletes="all")
 
-    manager = relationship("User", foreign_keys=[manager_id])
+    __table_args__ = (
+        Index("ix_shops_manager_created", "manager_id", created_at.desc()),
+    )
 
 
 class Counterparty(Base):
@@ -52,12 +94,15 @@ class Counterparty(Base):
     phone = Column(String, nullable=True)
     iin_bin = Column(String, nullable=True)
     address = Column(String, nullable=True)
-    debt = Column(Float, nullable=False, default=0.0)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    debt = Column(MONEY, nullable=False, default=0.0)
+    created_at = Column(DateTime, server_default=func.now())
     created_by_admin_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     is_archived = Column(Boolean, default=False, nullable=False)
 
-    created_by_admin = relationship("User")
+    created_by_admin = relationship("User", back_populates="created_counterparties")
+    sales_orders = relationship("SalesOrder", back_populates="counterparty", passive_deletes="all")
+    sales = relationship("CounterpartySale", back_populates="counterparty", passive_deletes="all")
+    debt_payments = relationship("CounterpartyDebtPayment", back_populates="counterparty", passive_deletes="all")
     company = synonym("company_name")
 
 
@@ -67,24 +112,35 @@ class SalesOrder(Base):
     id = Column(Integer, primary_key=True, index=True)
     counterparty_id = Column(Integer, ForeignKey("counterparties.id"), nullable=False)
     status = Column(String, nullable=False, default="draft")
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=func.now())
     closed_at = Column(DateTime, nullable=True)
     created_by_admin_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    total_amount = Column(Float, nullable=False, default=0.0)
-    paid_amount = Column(Float, nullable=False, default=0.0)
-    debt_amount = Column(Float, nullable=False, default=0.0)
+    total_amount = Column(MONEY, nullable=False, default=0.0)
+    paid_amount = Column(MONEY, nullable=False, default=0.0)
+    debt_amount = Column(MONEY, nullable=False, default=0.0)
 
-    counterparty = relationship("Counterparty")
-    created_by_admin = relationship("User")
+    counterparty = relationship("Counterparty", lazy="joined", back_populates="sales_orders")
+    created_by_admin = relationship("User", back_populates="created_sales_orders")
     items = relationship(
         "SalesOrderItem",
         back_populates="order",
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
     payments = relationship(
         "SalesOrderPayment",
         back_populates="order",
         cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+    __table_args__ = (
+        # Only unpaid closed orders feed the counterparty debt report; keep that index small
+        Index(
+            "ix_sales_orders_open_debt",
+            "counterparty_id",
+            postgresql_where=text("status = 'closed' AND debt_amount > 0"),
+        ),
     )
 
 
@@ -95,11 +151,11 @@ class SalesOrderItem(Base):
     sales_order_id = Column(Integer, ForeignKey("sales_orders.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Float, nullable=False)
-    price_at_time = Column(Float, nullable=False)
-    line_total = Column(Float, nullable=False)
+    price_at_time = Column(MONEY, nullable=False)
+    line_total = Column(MONEY, nullable=False)
 
     order = relationship("SalesOrder", back_populates="items")
-    product = relationship("Product")
+    product = relationship("Product", lazy="joined", back_populates="sales_order_items")
 
 
 class SalesOrderPayment(Base):
@@ -107,9 +163,9 @@ class SalesOrderPayment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     sales_order_id = Column(Integer, ForeignKey("sales_orders.id"), nullable=False)
-    paid_amount = Column(Float, nullable=False)
-    debt_amount = Column(Float, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    paid_amount = Column(MONEY, nullable=False)
+    debt_amount = Column(MONEY, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
 
     order = relationship("SalesOrder", back_populates="payments")
 
@@ -121,24 +177,25 @@ class CounterpartySale(Base):
     counterparty_id = Column(Integer, ForeignKey("counterparties.id"), nullable=False)
     created_by_admin_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     driver_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    total_amount = Column(Float, nullable=False, default=0.0)
-    paid_kaspi = Column(Float, nullable=False, default=0.0)
-    paid_cash = Column(Float, nullable=False, default=0.0)
-    paid_debt = Column(Float, nullable=False, default=0.0)
-    paid_total = Column(Float, nullable=False, default=0.0)
-    new_debt_added = Column(Float, nullable=False, default=0.0)
-    old_debt = Column(Float, nullable=False, default=0.0)
-    debt_after = Column(Float, nullable=False, default=0.0)
+    created_at = Column(DateTime, server_default=func.now())
+    total_amount = Column(MONEY, nullable=False, default=0.0)
+    paid_kaspi = Column(MONEY, nullable=False, default=0.0)
+    paid_cash = Column(MONEY, nullable=False, default=0.0)
+    paid_debt = Column(MONEY, nullable=False, default=0.0)
+    paid_total = Column(MONEY, nullable=False, default=0.0)
+    new_debt_added = Column(MONEY, nullable=False, default=0.0)
+    old_debt = Column(MONEY, nullable=False, default=0.0)
+    debt_after = Column(MONEY, nullable=False, default=0.0)
     note = Column(String, nullable=True)
 
-    counterparty = relationship("Counterparty")
-    created_by_admin = relationship("User")
-    driver = relationship("User", foreign_keys=[driver_id])
+    counterparty = relationship("Counterparty", lazy="joined", back_populates="sales")
+    created_by_admin = relationship("User", foreign_keys=[created_by_admin_id], back_populates="created_counterparty_sales")
+    driver = relationship("User", foreign_keys=[driver_id], back_populates="driven_counterparty_sales")
     items = relationship(
         "CounterpartySaleItem",
         back_populates="sale",
         cascade="all, delete-orphan",
+        lazy="selectin",
     )
 
 
@@ -149,11 +206,11 @@ class CounterpartySaleItem(Base):
     sale_id = Column(Integer, ForeignKey("counterparty_sales.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Float, nullable=False)
-    price_at_time = Column(Float, nullable=False)
-    line_total = Column(Float, nullable=False)
+    price_at_time = Column(MONEY, nullable=False)
+    line_total = Column(MONEY, nullable=False)
 
     sale = relationship("CounterpartySale", back_populates="items")
-    product = relationship("Product")
+    product = relationship("Product", lazy="joined", back_populates="counterparty_sale_items")
 
 
 class CounterpartyDebtPayment(Base):
@@ -161,16 +218,16 @@ class CounterpartyDebtPayment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     counterparty_id = Column(Integer, ForeignKey("counterparties.id"), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(MONEY, nullable=False)
     pay_method = Column(String, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=func.now())
     created_by_admin_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    debt_before = Column(Float, nullable=False)
-    debt_after = Column(Float, nullable=False)
+    debt_before = Column(MONEY, nullable=False)
+    debt_after = Column(MONEY, nullable=False)
     comment = Column(String, nullable=True)
 
-    counterparty = relationship("Counterparty")
-    created_by_admin = relationship("User")
+    counterparty = relationship("Counterparty", back_populates="debt_payments")
+    created_by_admin = relationship("User", back_populates="created_counterparty_debt_payments")
 
 
 class WarehouseSettings(Base):
@@ -182,7 +239,7 @@ class WarehouseSettings(Base):
     address = Column(String, nullable=True)
     phone = Column(String, nullable=True)
     bank_details = Column(Text, nullable=True)
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(DateTime, server_default=func.now())
 
 class Dispatch(Base):
     __tablename__ = "dispatches"
@@ -191,13 +248,21 @@ class Dispatch(Base):
     manager_id = Column(Integer, ForeignKey("users.id"))
     product_id = Column(Integer, ForeignKey("products.id"))
     quantity = Column(Integer)
-    price = Column(Float)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    price = Column(MONEY)
+    created_at = Column(DateTime, server_default=func.now())
     status = Column(String, default="pending")
     accepted_at = Column(DateTime, nullable=True)
+    manager_name = Column(String, nullable=True)
     
-    manager = relationship("User")
-    product = relationship("Product")
+    manager = relationship("User", back_populates="dispatches")
+    product = relationship("Product", back_populates="dispatches")
+
+    __table_args__ = (
+        Index("ix_dispatches_manager_created", "manager_id", created_at.desc()),
+        Index("ix_dispatches_status", "status"),
+        # Append-only: rows arrive in created_at order, so a BRIN index prunes date ranges at a fraction of a btree's size
+        Index("ix_dispatches_created_brin", "created_at", postgresql_using="brin"),
+    )
 
 class Order(Base):
     __tablename__ = "orders"
@@ -207,13 +272,19 @@ class Order(Base):
     shop_id = Column(Integer, ForeignKey("shops.id"))
     product_id = Column(Integer, ForeignKey("products.id"))
     quantity = Column(Integer)
-    price = Column(Float)
+    price = Column(MONEY)
     refrigerator_number = Column(String)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=func.now())
     
-    manager = relationship("User")
-    shop = relationship("Shop")
-    product = relationship("Product")
+    manager = relationship("User", back_populates="orders")
+    shop = relationship("Shop", back_populates="orders")
+    product = relationship("Product", back_populates="orders")
+
+    __table_args__ = (
+        Index("ix_orders_manager_created", "manager_id", "created_at"),
+        Index("ix_orders_shop_created", "shop_id", "created_at"),
+        Index("ix_orders_created_brin", "created_at", postgresql_using="brin"),
+    )
 
 class Return(Base):
     __tablename__ = "returns"
@@ -223,22 +294,27 @@ class Return(Base):
     shop_id = Column(Integer, ForeignKey("shops.id"))
     product_id = Column(Integer, ForeignKey("products.id"))
     quantity = Column(Integer)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, server_default=func.now())
 
-    manager = relationship("User")
-    shop = relationship("Shop")
-    product = relationship("Product")
+    manager = relationship("User", back_populates="returns")
+    shop = relationship("Shop", back_populates="returns")
+    product = relationship("Product", back_populates="returns")
+
+    __table_args__ = (
+        Index("ix_returns_manager_created", "manager_id", "created_at"),
+        Index("ix_returns_created_brin", "created_at", postgresql_using="brin"),
+    )
 
 
 class Incoming(Base):
     __tablename__ = "incoming"
 
     id = Column(Integer, primary_key=True, index=True)
-    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
     created_by_admin_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
-    items = relationship("IncomingItem", back_populates="incoming")
-    created_by_admin = relationship("User")
+    items = relationship("IncomingItem", back_populates="incoming", lazy="selectin")
+    created_by_admin = relationship("User", back_populates="created_incomings")
 
 
 class IncomingItem(Base):
@@ -247,11 +323,12 @@ class IncomingItem(Base):
     id = Column(Integer, primary_key=True, index=True)
     incoming_id = Column(Integer, ForeignKey("incoming.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    product_name = Column(String, nullable=True)
     quantity = Column(Integer, nullable=False)
-    price_at_time = Column(Float, nullable=False)
+    price_at_time = Column(MONEY, nullable=False)
 
     incoming = relationship("Incoming", back_populates="items")
-    product = relationship("Product")
+    product = relationship("Product", lazy="joined", back_populates="incoming_items")
 
 
 class ShopOrder(Base):
@@ -260,32 +337,43 @@ class ShopOrder(Base):
     id = Column(Integer, primary_key=True, index=True)
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     shop_id = Column(Integer, ForeignKey("shops.id"), nullable=False)
-    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    manager_name = Column(String, nullable=True)
+    shop_name = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    # Copy of the line items written with the order so list reads skip the item table
+    items_cache = deferred(Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True))
 
-    items = relationship("ShopOrderItem", back_populates="order")
+    items = relationship("ShopOrderItem", back_populates="order", lazy="selectin")
     payment = relationship(
         "ShopOrderPayment",
         uselist=False,
         back_populates="order",
         cascade="all, delete-orphan",
     )
-    manager = relationship("User")
-    shop = relationship("Shop")
+    manager = relationship("User", back_populates="shop_orders")
+    shop = relationship("Shop", lazy="joined", back_populates="shop_orders")
+
+    __table_args__ = (
+        Index("ix_shop_orders_manager_created", "manager_id", "created_at"),
+        Index("ix_shop_orders_shop_created", "shop_id", "created_at"),
+        Index("ix_shop_orders_created_brin", "created_at", postgresql_using="brin"),
+    )
 
 
 class ShopOrderItem(Base):
     __tablename__ = "shop_order_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("shop_orders.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("shop_orders.id"), nullable=False, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    product_name = Column(String, nullable=True)
     quantity = Column(Numeric, nullable=False)
-    price = Column(Numeric, nullable=True)
+    price = Column(Numeric(14, 2), nullable=True)
     is_bonus = Column(Boolean, nullable=False, default=False)
     is_return = Column(Boolean, nullable=False, default=False)
 
     order = relationship("ShopOrder", back_populates="items")
-    product = relationship("Product")
+    product = relationship("Product", lazy="joined", back_populates="shop_order_items")
 
 
 class ShopOrderPayment(Base):
@@ -293,13 +381,13 @@ class ShopOrderPayment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     order_id = Column(Integer, ForeignKey("shop_orders.id"), nullable=False, unique=True)
-    total_amount = Column(Numeric, nullable=False)
-    total_goods_amount = Column(Numeric, nullable=False)
-    returns_amount = Column(Numeric, nullable=False, default=0)
-    payable_amount = Column(Numeric, nullable=False)
-    paid_amount = Column(Numeric, nullable=False)
-    debt_amount = Column(Numeric, nullable=False)
-    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    total_amount = Column(Numeric(14, 2), nullable=False)
+    total_goods_amount = Column(Numeric(14, 2), nullable=False)
+    returns_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    payable_amount = Column(Numeric(14, 2), nullable=False)
+    paid_amount = Column(Numeric(14, 2), nullable=False)
+    debt_amount = Column(Numeric(14, 2), nullable=False)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
 
     order = relationship("ShopOrder", back_populates="payment")
 
@@ -310,11 +398,16 @@ class ShopDebtPayment(Base):
     id = Column(Integer, primary_key=True, index=True)
     shop_id = Column(Integer, ForeignKey("shops.id"), nullable=False)
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    amount = Column(Float, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    amount = Column(MONEY, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    shop = relationship("Shop", back_populates="debt_payments")
+    manager = relationship("User", back_populates="shop_debt_payments")
 
-    shop = relationship("Shop")
-    manager = relationship("User")
+    __table_args__ = (
+        Index("ix_shop_debt_payments_shop_created", "shop_id", "created_at"),
+        Index("ix_shop_debt_payments_manager_created", "manager_id", "created_at"),
+    )
 
 
 class ShopReturn(Base):
@@ -323,23 +416,31 @@ class ShopReturn(Base):
     id = Column(Integer, primary_key=True, index=True)
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     shop_id = Column(Integer, ForeignKey("shops.id"), nullable=False)
-    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    manager_name = Column(String, nullable=True)
+    shop_name = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    items = relationship("ShopReturnItem", back_populates="return_doc", lazy="selectin")
+    manager = relationship("User", back_populates="shop_returns")
+    shop = relationship("Shop", lazy="joined", back_populates="shop_returns")
 
-    items = relationship("ShopReturnItem", back_populates="return_doc")
-    manager = relationship("User")
-    shop = relationship("Shop")
+    __table_args__ = (
+        Index("ix_shop_returns_manager_created", "manager_id", "created_at"),
+        Index("ix_shop_returns_shop_created", "shop_id", "created_at"),
+    )
 
 
 class ShopReturnItem(Base):
     __tablename__ = "shop_return_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    return_id = Column(Integer, ForeignKey("shop_returns.id"), nullable=False)
+    return_id = Column(Integer, ForeignKey("shop_returns.id"), nullable=False, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    product_name = Column(String, nullable=True)
     quantity = Column(Numeric, nullable=False)
 
     return_doc = relationship("ShopReturn", back_populates="items")
-    product = relationship("Product")
+    product = relationship("Product", lazy="joined", back_populates="shop_return_items")
 
 
 class ManagerReturn(Base):
@@ -347,22 +448,28 @@ class ManagerReturn(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    manager_name = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    items = relationship("ManagerReturnItem", back_populates="return_doc", lazy="selectin")
+    manager = relationship("User", back_populates="manager_returns")
 
-    items = relationship("ManagerReturnItem", back_populates="return_doc")
-    manager = relationship("User")
+    __table_args__ = (
+        Index("ix_manager_returns_manager_created", "manager_id", "created_at"),
+    )
 
 
 class ManagerReturnItem(Base):
     __tablename__ = "manager_return_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    return_id = Column(Integer, ForeignKey("manager_returns.id"), nullable=False)
+    return_id = Column(Integer, ForeignKey("manager_returns.id"), nullable=False, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    product_name = Column(String, nullable=True)
     quantity = Column(Numeric, nullable=False)
 
     return_doc = relationship("ManagerReturn", back_populates="items")
-    product = relationship("Product")
+    product = relationship("Product", lazy="joined", back_populates="manager_return_items")
 
 
 class DriverDailyReport(Base):
@@ -370,11 +477,16 @@ class DriverDailyReport(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    report_date = Column(Date, default=date.today, nullable=False)
-    cash_amount = Column(Float, default=0.0, nullable=False)
-    card_amount = Column(Float, default=0.0, nullable=False)
-    other_expenses = Column(Float, default=0.0, nullable=False)
+    report_date = Column(Date, server_default=func.current_date(), nullable=False)
+    cash_amount = Column(MONEY, default=0.0, nullable=False)
+    card_amount = Column(MONEY, default=0.0, nullable=False)
+    other_expenses = Column(MONEY, default=0.0, nullable=False)
     other_details = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    manager = relationship("User", back_populates="daily_reports")
 
-    manager = relationship("User")
+    __table_args__ = (
+        Index("ix_driver_daily_reports_manager_date", "manager_id", "report_date"),
+        Index("ix_driver_daily_reports_date_brin", "report_date", postgresql_using="brin"),
+    )
@@ -1,38 +1,60 @@
-from pydantic import BaseModel, condecimal
-from typing import Optional, List, Literal
-from datetime import datetime, timezone, date
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, PlainSerializer, RootModel, Tag, TypeAdapter, computed_field
+from pydantic.dataclasses import dataclass
+from typing import Annotated, Optional, List, Literal, Union
+from datetime import datetime, date
 from decimal import Decimal
 
-class ProductBase(BaseModel):
+# Shared constrained types so every payload model reuses the same validator
+PositiveDecimal = Annotated[Decimal, Field(gt=0)]
+NonNegativeDecimal = Annotated[Decimal, Field(ge=0)]
+# Money is validated as Decimal but written to JSON as a number, which is what the frontend reads
+Money = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
+# Decimals are immutable, so one shared zero serves every default and running total
+ZERO = Decimal("0")
+
+
+class _Schema(BaseModel):
+    # Validators are built on first use, so importing the module does not compile every schema up front
+    model_config = ConfigDict(defer_build=True)
+
+
+# Flat output rows are slotted pydantic dataclasses: same validation and JSON, much cheaper per instance than BaseModel
+_row = dataclass(frozen=True, slots=True)
+
+
+class _ProductQtyItem(_Schema):
+    product_id: int
+    quantity: PositiveDecimal
+
+
+class _ProductItemOut(_Schema):
+    product_id: int
+    product_name: str
+
+
+class ProductBase(_Schema):
     name: str
     quantity: int
-    price: float
+    price: Money
 
 class ProductCreate(ProductBase):
     is_return: bool = False
 
-class ProductUpdate(BaseModel):
+class ProductUpdate(_Schema):
     name: Optional[str] = None
     quantity: Optional[int] = None
-    price: Optional[float] = None
+    price: Optional[Money] = None
 
 
-class ProductOut(ProductBase):
-    id: int
-
-    class Config:
-        from_attributes = True
-
 class Product(ProductBase):
     id: int
     manager_id: Optional[int]
     is_return: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
-class ShopBase(BaseModel):
+class ShopBase(_Schema):
     name: str
     address: str
     phone: str
@@ -43,7 +65,7 @@ class ShopCreate(ShopBase):
     pass
 
 
-class ShopUpdate(BaseModel):
+class ShopUpdate(_Schema):
     name: Optional[str] = None
     address: Optional[str] = None
     phone: Optional[str] = None
@@ -57,8 +79,7 @@ class ShopOut(ShopBase):
     manager_name: Optional[str] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Shop(ShopBase):
@@ -66,11 +87,10 @@ class Shop(ShopBase):
     debt: float
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class CounterpartyBase(BaseModel):
+class CounterpartyBase(_Schema):
     name: str
     company: Optional[str] = None
     phone: Optional[str] = None
@@ -81,7 +101,7 @@ class CounterpartyCreate(CounterpartyBase):
     debt: Optional[float] = None
 
 
-class CounterpartyUpdate(BaseModel):
+class CounterpartyUpdate(_Schema):
     name: Optional[str] = None
     company: Optional[str] = None
     phone: Optional[str] = None
@@ -96,39 +116,34 @@ class CounterpartyOut(CounterpartyBase):
     created_by_admin_id: int
     is_archived: bool
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class SalesOrderItemInput(BaseModel):
-    product_id: int
-    quantity: condecimal(gt=0)
-    price: Optional[condecimal(ge=0)] = None
+class SalesOrderItemInput(_ProductQtyItem):
+    price: Optional[NonNegativeDecimal] = None
 
 
-class SalesOrderCreate(BaseModel):
+class SalesOrderCreate(_Schema):
     counterparty_id: int
     items: List[SalesOrderItemInput]
 
 
-class SalesOrderUpdate(BaseModel):
+class SalesOrderUpdate(_Schema):
     counterparty_id: Optional[int] = None
     items: List[SalesOrderItemInput]
 
 
-class SalesOrderClose(BaseModel):
-    paid_amount: condecimal(ge=0)
+class SalesOrderClose(_Schema):
+    paid_amount: NonNegativeDecimal
 
 
-class SalesOrderItemOut(BaseModel):
-    product_id: int
-    product_name: str
+class SalesOrderItemOut(_ProductItemOut):
     quantity: float
     price_at_time: float
     line_total: float
 
 
-class SalesOrderCounterpartyOut(BaseModel):
+class SalesOrderCounterpartyOut(_Schema):
     id: int
     name: str
     company_name: Optional[str] = None
@@ -137,7 +152,7 @@ class SalesOrderCounterpartyOut(BaseModel):
     address: Optional[str] = None
 
 
-class SalesOrderOut(BaseModel):
+class SalesOrderOut(_Schema):
     id: int
     counterparty: SalesOrderCounterpartyOut
     status: str
@@ -150,7 +165,7 @@ class SalesOrderOut(BaseModel):
     items: List[SalesOrderItemOut]
 
 
-class SalesOrderListItem(BaseModel):
+class SalesOrderListItem(_Schema):
     id: int
     counterparty_id: int
     counterparty_name: str
@@ -159,18 +174,16 @@ class SalesOrderListItem(BaseModel):
     total_amount: float
 
 
-class CounterpartySalePayment(BaseModel):
-    kaspi: condecimal(ge=0) = 0
-    cash: condecimal(ge=0) = 0
+class CounterpartySalePayment(_Schema):
+    kaspi: NonNegativeDecimal = 0
+    cash: NonNegativeDecimal = 0
 
 
-class CounterpartySaleItemCreate(BaseModel):
-    product_id: int
-    quantity: condecimal(gt=0)
-    price: condecimal(ge=0)
+class CounterpartySaleItemCreate(_ProductQtyItem):
+    price: NonNegativeDecimal
 
 
-class CounterpartySaleCreate(BaseModel):
+class CounterpartySaleCreate(_Schema):
     counterparty_id: int
     driver_id: Optional[int] = None
     items: List[CounterpartySaleItemCreate]
@@ -178,7 +191,7 @@ class CounterpartySaleCreate(BaseModel):
     note: Optional[str] = None
 
 
-class CounterpartyShortOut(BaseModel):
+class CounterpartyShortOut(_Schema):
     id: int
     name: str
     company: Optional[str] = None
@@ -186,15 +199,13 @@ class CounterpartyShortOut(BaseModel):
     address: Optional[str] = None
 
 
-class CounterpartySaleItemOut(BaseModel):
-    product_id: int
-    product_name: str
+class CounterpartySaleItemOut(_ProductItemOut):
     quantity: float
     price_at_time: float
     line_total: float
 
 
-class CounterpartySaleOut(BaseModel):
+class CounterpartySaleOut(_Schema):
     id: int
     counterparty: CounterpartyShortOut
     created_at: datetime
@@ -210,7 +221,7 @@ class CounterpartySaleOut(BaseModel):
     items: List[CounterpartySaleItemOut]
 
 
-class CounterpartySaleListItem(BaseModel):
+class CounterpartySaleListItem(_Schema):
     id: int
     counterparty: CounterpartyShortOut
     created_at: datetime
@@ -220,7 +231,7 @@ class CounterpartySaleListItem(BaseModel):
     debt_after: float
 
 
-class CounterpartySalesReportRow(BaseModel):
+class CounterpartySalesReportRow(_Schema):
     id: int
     date: datetime
     counterparty_id: int
@@ -234,7 +245,7 @@ class CounterpartySalesReportRow(BaseModel):
     debt_for_sale: float
 
 
-class CounterpartySalesReportTotals(BaseModel):
+class CounterpartySalesReportTotals(_Schema):
     sales_total: float
     paid_cash_total: float
     paid_kaspi_total: float
@@ -242,18 +253,18 @@ class CounterpartySalesReportTotals(BaseModel):
     debt_total: float
 
 
-class CounterpartySalesReport(BaseModel):
+class CounterpartySalesReport(_Schema):
     totals: CounterpartySalesReportTotals
     sales: List[CounterpartySalesReportRow]
 
 
-class CounterpartyDebtPaymentCreate(BaseModel):
-    amount: condecimal(gt=0)
+class CounterpartyDebtPaymentCreate(_Schema):
+    amount: PositiveDecimal
     method: Literal["kaspi", "cash"]
     comment: Optional[str] = None
 
 
-class WarehouseSettingsBase(BaseModel):
+class WarehouseSettingsBase(_Schema):
     company_name: Optional[str] = None
     bin: Optional[str] = None
     address: Optional[str] = None
@@ -265,11 +276,10 @@ class WarehouseSettingsOut(WarehouseSettingsBase):
     id: int
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class CounterpartyReportRow(BaseModel):
+class CounterpartyReportRow(_Schema):
     id: int
     date: datetime
     total: float
@@ -277,36 +287,35 @@ class CounterpartyReportRow(BaseModel):
     debt: float
 
 
-class CounterpartyReportSummary(BaseModel):
+class CounterpartyReportSummary(_Schema):
     total_turnover: float
     total_paid: float
     total_debt: float
     orders: List[CounterpartyReportRow]
 
 
-class CounterpartyDebtItem(BaseModel):
+class CounterpartyDebtItem(_Schema):
     counterparty_id: int
     counterparty_name: str
     total_debt: float
     last_sale_date: Optional[datetime] = None
 
 
-class ShopDebtPaymentCreate(BaseModel):
+class ShopDebtPaymentCreate(_Schema):
     amount: float
     shop_id: Optional[int] = None
 
 
-class ShopDebtPaymentOut(BaseModel):
+class ShopDebtPaymentOut(_Schema):
     id: int
     shop_id: int
     manager_id: int
     amount: float
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
-class ManagerBase(BaseModel):
+class ManagerBase(_Schema):
     username: str
     full_name: str
 
@@ -314,7 +323,7 @@ class ManagerCreate(ManagerBase):
     password: str
     is_active: bool = True
 
-class ManagerUpdate(BaseModel):
+class ManagerUpdate(_Schema):
     full_name: Optional[str] = None
     password: Optional[str] = None
     is_active: Optional[bool] = None
@@ -325,28 +334,25 @@ class Manager(ManagerBase):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
-class DispatchItemCreate(BaseModel):
+class DispatchItemCreate(_Schema):
     product_id: int
     quantity: int
-    price: float
+    price: Money
 
 
-class DispatchCreate(BaseModel):
+class DispatchCreate(_Schema):
     manager_id: int
     items: List[DispatchItemCreate]
 
 
-class DispatchItemOut(BaseModel):
-    product_id: int
-    product_name: str
+class DispatchItemOut(_ProductItemOut):
     quantity: int
-    price: float
+    price: Money
 
 
-class DispatchOut(BaseModel):
+class DispatchOut(_Schema):
     id: int
     manager_id: int
     manager_name: Optional[str] = None
@@ -356,52 +362,51 @@ class DispatchOut(BaseModel):
     items: List[DispatchItemOut]
 
 
-class OrderItem(BaseModel):
+class OrderItem(_Schema):
     product_id: int
     quantity: int
-    price: float
+    price: Money
 
-class OrderCreate(BaseModel):
+class OrderCreate(_Schema):
     shop_id: int
     refrigerator_number: str
     items: List[OrderItem]
-    paid_amount: float = 0.0
+    paid_amount: Money = ZERO
 
-class ManagerStockItem(BaseModel):
+class ManagerStockItem(_Schema):
     product_id: int
     name: str
     quantity: int
-    price: Optional[float] = None
+    price: Optional[Money] = None
 
 
-class ReturnItemCreate(BaseModel):
+class ReturnItemCreate(_Schema):
     product_id: int
     quantity: int
 
 
-class ReturnCreate(BaseModel):
+class ReturnCreate(_Schema):
     items: List[ReturnItemCreate]
 
 
-class ReturnCreated(BaseModel):
+class ReturnCreated(_Schema):
     id: int
     created_at: datetime
 
 
-class ReturnListItem(BaseModel):
+@_row
+class ReturnListItem:
     id: int
     created_at: datetime
     manager_id: int
     manager_name: Optional[str] = None
 
 
-class ReturnDetailItem(BaseModel):
-    product_id: int
-    product_name: str
+class ReturnDetailItem(_ProductItemOut):
     quantity: int
 
 
-class ReturnDetail(BaseModel):
+class ReturnDetail(_Schema):
     id: int
     created_at: datetime
     manager_id: int
@@ -409,63 +414,81 @@ class ReturnDetail(BaseModel):
     items: List[ReturnDetailItem]
 
 
-class IncomingItemCreate(BaseModel):
-    product_id: int
-    quantity: condecimal(gt=0)
+class IncomingItemCreate(_ProductQtyItem):
+    pass
 
 
-class IncomingCreate(BaseModel):
-    product_id: Optional[int] = None
-    quantity: Optional[condecimal(gt=0)] = None
+class IncomingSingle(_ProductQtyItem):
+    pass
+
+
+class IncomingBatch(_Schema):
+    # Left optional so incomplete payloads reach the route and get its 400 rather than a validation error
     items: Optional[List[IncomingItemCreate]] = None
 
 
-class IncomingCreated(BaseModel):
+def _incoming_kind(value) -> str:
+    if isinstance(value, dict):
+        fields = (value.get("items"), value.get("product_id"), value.get("quantity"))
+    else:
+        fields = (getattr(value, "items", None), getattr(value, "product_id", None), getattr(value, "quantity", None))
+    items, product_id, quantity = fields
+    return "single" if not items and product_id is not None and quantity is not None else "batch"
+
+
+# Incoming accepts one product or a list of items; the payload shape picks the branch so only one is validated
+class IncomingCreate(
+    RootModel[
+        Annotated[
+            Union[Annotated[IncomingSingle, Tag("single")], Annotated[IncomingBatch, Tag("batch")]],
+            Discriminator(_incoming_kind),
+        ]
+    ]
+):
+    model_config = ConfigDict(defer_build=True)
+
+
+class IncomingCreated(_Schema):
     id: int
     created_at: datetime
 
 
-class IncomingListItem(BaseModel):
+@_row
+class IncomingListItem:
     id: int
     created_at: datetime
 
 
-class IncomingDetailItem(BaseModel):
-    product_id: int
-    product_name: str
+class IncomingDetailItem(_ProductItemOut):
     quantity: int
 
 
-class IncomingDetail(BaseModel):
+class IncomingDetail(_Schema):
     id: int
     created_at: datetime
     items: List[IncomingDetailItem]
 
 
-class ShopOrderItemCreate(BaseModel):
-    product_id: int
-    quantity: condecimal(gt=0)
-    price: Optional[condecimal(ge=0)] = None
+class ShopOrderItemCreate(_ProductQtyItem):
+    price: Optional[NonNegativeDecimal] = None
     is_bonus: bool = False
     is_return: bool = False
 
 
-class ShopOrderCreate(BaseModel):
+class ShopOrderCreate(_Schema):
     shop_id: int
     items: List[ShopOrderItemCreate]
-    paid_amount: condecimal(ge=0)
+    paid_amount: NonNegativeDecimal
 
 
-class ShopOrderItemOut(BaseModel):
-    product_id: int
-    product_name: str
+class ShopOrderItemOut(_ProductItemOut):
     quantity: float
-    price: Optional[float] = None
+    price: Optional[Money] = None
     is_bonus: bool
     is_return: bool
 
 
-class ShopOrderPaymentOut(BaseModel):
+class ShopOrderPaymentOut(_Schema):
     total_amount: Decimal
     total_goods_amount: Decimal
     returns_amount: Decimal
@@ -474,7 +497,7 @@ class ShopOrderPaymentOut(BaseModel):
     debt_amount: Decimal
 
 
-class ShopOrderOut(BaseModel):
+class ShopOrderOut(_Schema):
     id: int
     manager_id: int
     shop_id: int
@@ -484,7 +507,7 @@ class ShopOrderOut(BaseModel):
     payment: Optional[ShopOrderPaymentOut] = None
 
 
-class ShopOrderItemDetail(BaseModel):
+class ShopOrderItemDetail(_Schema):
     product_name: str
     quantity: Decimal
     price: Decimal
@@ -493,7 +516,7 @@ class ShopOrderItemDetail(BaseModel):
     line_total: Decimal
 
 
-class ShopOrderPaymentDetail(BaseModel):
+class ShopOrderPaymentDetail(_Schema):
     total_amount: Decimal
     returns_amount: Decimal
     payable_amount: Decimal
@@ -501,27 +524,38 @@ class ShopOrderPaymentDetail(BaseModel):
     debt_amount: Decimal
 
 
-class ShopOrderDetail(BaseModel):
+class ShopOrderDetail(_Schema):
     id: int
     shop_name: str
     manager_name: str
     created_at: datetime
     items: List[ShopOrderItemDetail]
     payment: ShopOrderPaymentDetail
-    total_goods_amount: Decimal
-    total_bonus_amount: Decimal
-    total_return_amount: Decimal
 
+    # Totals are derived from the items when the response is written, so they are never passed in or validated
+    @computed_field
+    @property
+    def total_goods_amount(self) -> Decimal:
+        return sum((item.line_total for item in self.items if not item.is_return and not item.is_bonus), ZERO)
 
-class ManagerReturnDetailItem(BaseModel):
-    product_id: int
-    product_name: str
+    @computed_field
+    @property
+    def total_bonus_amount(self) -> Decimal:
+        return sum((item.line_total for item in self.items if item.is_bonus and not item.is_return), ZERO)
+
+    @computed_field
+    @property
+    def total_return_amount(self) -> Decimal:
+        return sum((item.line_total for item in self.items if item.is_return), ZERO)
+
+
+class ManagerReturnDetailItem(_ProductItemOut):
     quantity: Decimal
     price: Decimal
     line_total: Decimal
 
 
-class ManagerReturnDetail(BaseModel):
+class ManagerReturnDetail(_Schema):
     id: int
     manager_id: int
     manager_name: str
@@ -530,15 +564,13 @@ class ManagerReturnDetail(BaseModel):
     items: List[ManagerReturnDetailItem]
 
 
-class ShopReturnDetailItem(BaseModel):
-    product_id: int
-    product_name: str
+class ShopReturnDetailItem(_ProductItemOut):
     quantity: Decimal
     price: Decimal
     line_total: Decimal
 
 
-class ShopReturnDetail(BaseModel):
+class ShopReturnDetail(_Schema):
     id: int
     manager_id: int
     manager_name: str
@@ -550,23 +582,20 @@ class ShopReturnDetail(BaseModel):
     items: List[ShopReturnDetailItem]
 
 
-class ShopReturnItemCreate(BaseModel):
-    product_id: int
-    quantity: condecimal(gt=0)
+class ShopReturnItemCreate(_ProductQtyItem):
+    pass
 
 
-class ShopReturnCreate(BaseModel):
+class ShopReturnCreate(_Schema):
     shop_id: int
     items: List[ShopReturnItemCreate]
 
 
-class ShopReturnItemOut(BaseModel):
-    product_id: int
-    product_name: str
+class ShopReturnItemOut(_ProductItemOut):
     quantity: float
 
 
-class ShopReturnOut(BaseModel):
+class ShopReturnOut(_Schema):
     id: int
     manager_id: int
     manager_name: Optional[str] = None
@@ -576,41 +605,38 @@ class ShopReturnOut(BaseModel):
     items: List[ShopReturnItemOut]
 
 
-class ManagerReturnItemCreate(BaseModel):
-    product_id: int
-    quantity: condecimal(gt=0)
+class ManagerReturnItemCreate(_ProductQtyItem):
+    pass
 
 
-class ManagerReturnCreate(BaseModel):
+class ManagerReturnCreate(_Schema):
     items: List[ManagerReturnItemCreate]
 
 
-class ManagerReturnCreated(BaseModel):
+class ManagerReturnCreated(_Schema):
     id: int
     created_at: datetime
 
 
-class ManagerReturnItemOut(BaseModel):
-    product_id: int
-    product_name: str
+class ManagerReturnItemOut(_ProductItemOut):
     quantity: float
 
 
-class ManagerReturnOut(BaseModel):
+class ManagerReturnOut(_Schema):
     id: int
     manager_id: int
     created_at: datetime
     items: List[ManagerReturnItemOut]
 
 
-class DriverDailyReportCreate(BaseModel):
+class DriverDailyReportCreate(_Schema):
     cash_amount: float
     card_amount: float
     other_expenses: float
     other_details: str
 
 
-class DriverDailyReportOut(BaseModel):
+class DriverDailyReportOut(_Schema):
     id: int
     manager_id: int
     report_date: date
@@ -620,17 +646,16 @@ class DriverDailyReportOut(BaseModel):
     other_details: str
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class DriverBalanceOut(BaseModel):
+class DriverBalanceOut(_Schema):
     total_received_today: float
     already_returned_today: float
     available: float
 
 
-class ManagerDailySummary(BaseModel):
+class ManagerDailySummary(_Schema):
     received_qty: Decimal
     received_amount: Decimal
 
@@ -645,14 +670,36 @@ class ManagerDailySummary(BaseModel):
     return_from_shops_amount: Decimal
 
 
-class MovementRow(BaseModel):
+@_row
+class _MovementRowBase:
     time: datetime
-    shop_name: Optional[str] = None
-    type: Literal["delivery", "return_to_main", "return_from_shop"]
     id: int
+    shop_name: Optional[str] = None
+
+
+@_row
+class DeliveryMovementRow(_MovementRowBase):
+    type: Literal["delivery"] = "delivery"
+
+
+@_row
+class ReturnToMainMovementRow(_MovementRowBase):
+    type: Literal["return_to_main"] = "return_to_main"
 
 
-class ManagerDailyReport(BaseModel):
+@_row
+class ReturnFromShopMovementRow(_MovementRowBase):
+    type: Literal["return_from_shop"] = "return_from_shop"
+
+
+# Rows are tagged by `type`, so validation picks the row class with one lookup instead of trying each in turn
+MovementRow = Annotated[
+    Union[DeliveryMovementRow, ReturnToMainMovementRow, ReturnFromShopMovementRow],
+    Field(discriminator="type"),
+]
+
+
+class ManagerDailyReport(_Schema):
     date: date
     summary: ManagerDailySummary
     deliveries: List[MovementRow]
@@ -665,7 +712,8 @@ class AdminDailyReport(ManagerDailyReport):
     manager_name: str
 
 
-class ShopDayStat(BaseModel):
+@_row
+class ShopDayStat:
     date: date
     issued_total: Decimal
     returns_total: Decimal
@@ -673,23 +721,44 @@ class ShopDayStat(BaseModel):
     debt_total: Decimal
 
 
-class ShopDocumentRow(BaseModel):
+@_row
+class _ShopDocumentRowBase:
     id: int
-    type: Literal["delivery", "return_from_shop", "bonus"]
     date: datetime
     amount: Decimal
     manager_name: str
     debt_amount: Optional[Decimal] = None
 
 
-class AdminShopPeriodSummary(BaseModel):
+@_row
+class DeliveryDocumentRow(_ShopDocumentRowBase):
+    type: Literal["delivery"] = "delivery"
+
+
+@_row
+class ReturnFromShopDocumentRow(_ShopDocumentRowBase):
+    type: Literal["return_from_shop"] = "return_from_shop"
+
+
+@_row
+class BonusDocumentRow(_ShopDocumentRowBase):
+    type: Literal["bonus"] = "bonus"
+
+
+ShopDocumentRow = Annotated[
+    Union[DeliveryDocumentRow, ReturnFromShopDocumentRow, BonusDocumentRow],
+    Field(discriminator="type"),
+]
+
+
+class AdminShopPeriodSummary(_Schema):
     issued_total: Decimal
     returns_total: Decimal
     bonuses_total: Decimal
     debt_total: Decimal
 
 
-class AdminShopPeriodReport(BaseModel):
+class AdminShopPeriodReport(_Schema):
     shop_id: int
     shop_name: str
     date_from: date
@@ -699,3 +768,13 @@ class AdminShopPeriodReport(BaseModel):
     deliveries: List[ShopDocumentRow]
     returns_from_shop: List[ShopDocumentRow]
     bonuses: List[ShopDocumentRow]
+
+
+# List adapters are built once at import so list endpoints reuse the compiled validator/serializer
+DispatchOutList = TypeAdapter(List[DispatchOut])
+ShopOrderOutList = TypeAdapter(List[ShopOrderOut])
+ShopReturnOutList = TypeAdapter(List[ShopReturnOut])
+ManagerReturnOutList = TypeAdapter(List[ManagerReturnOut])
+MovementRowList = TypeAdapter(List[MovementRow])
+ShopDayStatList = TypeAdapter(List[ShopDayStat])
+ShopDocumentRowList = TypeAdapter(List[ShopDocumentRow])
@@ -0,0 +1,125 @@
+import os
+import uuid
+
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    # main runs PostgreSQL-only migrations on import, so every test needs a real database
+    reason = None
+    if not os.getenv("DATABASE_URL", "").startswith("postgresql"):
+        reason = "needs DATABASE_URL pointing at a PostgreSQL database"
+    else:
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            reason = "needs httpx for the FastAPI test client"
+
+    if reason is None:
+        return
+
+    marker = pytest.mark.skip(reason=reason)
+    for item in items:
+        item.add_marker(marker)
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    # Importing main creates the ORM tables and runs the startup migrations
+    import main
+
+    return main
+
+
+@pytest.fixture
+def connection(app_module):
+    from sqlalchemy import text
+
+    from database import engine
+
+    # Each test runs inside one outer transaction that is rolled back afterwards
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        # dispatch_items predates the ORM models and is not created by the startup migrations
+        connection.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS dispatch_items (
+                    id SERIAL PRIMARY KEY,
+                    dispatch_id INTEGER NOT NULL REFERENCES dispatches(id) ON DELETE CASCADE,
+                    product_id INTEGER NOT NULL REFERENCES products(id),
+                    product_name VARCHAR,
+                    quantity INTEGER NOT NULL,
+                    price NUMERIC(14, 2)
+                )
+                """
+            )
+        )
+        try:
+            yield connection
+        finally:
+            transaction.rollback()
+
+
+@pytest.fixture
+def session_factory(app_module, connection, monkeypatch):
+    from sqlalchemy.orm import sessionmaker
+
+    from database import get_db
+
+    # Commits inside the app only release savepoints of the outer test transaction
+    factory = sessionmaker(
+        bind=connection,
+        autocommit=False,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(app_module, "SessionLocal", factory)
+    app_module.app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield factory
+    finally:
+        app_module.app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture
+def client(app_module, session_factory):
+    from fastapi.testclient import TestClient
+
+    return TestClient(app_module.app)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(app_module, db):
+    import models
+
+    def factory(role):
+        user = models.User(
+            username=f"{role}-{uuid.uuid4().hex[:8]}",
+            password=app_module.get_password_hash("secret"),
+            role=role,
+            full_name=f"Test {role}",
+        )
+        db.add(user)
+        db.commit()
+        token = app_module.create_access_token({"sub": user.username, "uid": user.id, "role": role})
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return factory
@@ -0,0 +1,72 @@
+import pytest
+
+import models
+
+
+@pytest.fixture
+def dispatch_setup(db, make_user):
+    _, admin_headers = make_user("admin")
+    manager, manager_headers = make_user("manager")
+    product = models.Product(name="Eclair", quantity=20, price=5.0, manager_id=None, is_return=False)
+    db.add(product)
+    db.commit()
+    return {
+        "admin_headers": admin_headers,
+        "manager_headers": manager_headers,
+        "manager_id": manager.id,
+        "product_id": product.id,
+    }
+
+
+def test_dispatch_create_and_accept_match_reads(client, dispatch_setup):
+    created = client.post(
+        "/dispatch",
+        json={
+            "manager_id": dispatch_setup["manager_id"],
+            "items": [{"product_id": dispatch_setup["product_id"], "quantity": 3, "price": 5}],
+        },
+        headers=dispatch_setup["admin_headers"],
+    )
+    assert created.status_code == 200, created.text
+    dispatch_id = created.json()["id"]
+
+    fetched = client.get(f"/dispatch/{dispatch_id}", headers=dispatch_setup["admin_headers"])
+    assert fetched.status_code == 200, fetched.text
+    assert created.json() == fetched.json()
+
+    accepted = client.post(f"/dispatch/{dispatch_id}/accept", headers=dispatch_setup["manager_headers"])
+    assert accepted.status_code == 200, accepted.text
+    assert accepted.json()["status"] == "sent"
+
+    listed = client.get("/dispatch", headers=dispatch_setup["manager_headers"])
+    assert listed.status_code == 200, listed.text
+    assert [row for row in listed.json() if row["id"] == dispatch_id] == [accepted.json()]
+
+
+def test_incoming_create_matches_list(client, dispatch_setup):
+    created = client.post(
+        "/incoming",
+        json={"product_id": dispatch_setup["product_id"], "quantity": 4},
+        headers=dispatch_setup["admin_headers"],
+    )
+    assert created.status_code == 200, created.text
+
+    listed = client.get("/incoming", headers=dispatch_setup["admin_headers"])
+    assert listed.status_code == 200, listed.text
+    assert created.json() in listed.json()
+
+
+def test_dispatch_list_reports_early_failure_as_error(app_module, session_factory, db, make_user, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    manager, manager_headers = make_user("manager")
+    db.add(models.Dispatch(manager_id=manager.id, status="pending"))
+    db.commit()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("items query failed")
+
+    monkeypatch.setattr(app_module, "_attach_dispatch_items", fail)
+    response = TestClient(app_module.app, raise_server_exceptions=False).get("/dispatch", headers=manager_headers)
+
+    assert response.status_code == 500
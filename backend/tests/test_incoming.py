@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {},
+        {"product_id": 1},
+        {"quantity": 2},
+        {"product_id": 1, "quantity": None},
+        {"items": []},
+        {"items": None},
+    ],
+)
+def test_incoming_without_items_is_rejected(client, make_user, payload):
+    _, admin_headers = make_user("admin")
+
+    response = client.post("/incoming", json=payload, headers=admin_headers)
+
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Необходимо указать товары"
+
+
+def test_incoming_validates_single_quantity(client, make_user):
+    _, admin_headers = make_user("admin")
+
+    response = client.post("/incoming", json={"product_id": 1, "quantity": 0}, headers=admin_headers)
+
+    assert response.status_code == 422, response.text
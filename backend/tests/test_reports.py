@@ -0,0 +1,36 @@
+from sqlalchemy import event
+
+import models
+from database import engine
+
+
+def test_manager_report_loads_product_names_once(client, db, make_user):
+    _, admin_headers = make_user("admin")
+    manager, _ = make_user("manager")
+    product = models.Product(name="Macaron", quantity=5, price=3.0, manager_id=None, is_return=False)
+    db.add(product)
+    db.flush()
+    db.add_all(
+        [
+            models.Dispatch(manager_id=manager.id, product_id=product.id, quantity=2, price=3.0, status="sent"),
+            models.Dispatch(manager_id=manager.id, product_id=product.id, quantity=1, price=3.0, status="sent"),
+        ]
+    )
+    db.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(f"/reports/manager/{manager.id}", headers=admin_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["total_received"] == 3
+    assert [row["product_name"] for row in body["dispatches"]] == ["Macaron", "Macaron"]
+    assert sum("products" in statement for statement in statements) == 1
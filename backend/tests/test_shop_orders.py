@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+import pytest
+
+import models
+
+
+@pytest.fixture
+def manager_setup(db, make_user):
+    manager, headers = make_user("manager")
+    shop = models.Shop(name="Test Shop", manager_id=manager.id, manager_name=manager.full_name, debt=0)
+    product = models.Product(name="Cake", quantity=10, price=10.0, manager_id=manager.id, is_return=False)
+    db.add_all([shop, product])
+    db.commit()
+    return {"headers": headers, "shop_id": shop.id, "product_id": product.id}
+
+
+def _product_quantity(db, product_id):
+    db.expire_all()
+    return db.get(models.Product, product_id).quantity
+
+
+def test_create_shop_order(client, db, manager_setup):
+    response = client.post(
+        "/shop-orders",
+        json={
+            "shop_id": manager_setup["shop_id"],
+            "items": [{"product_id": manager_setup["product_id"], "quantity": 2}],
+            "paid_amount": 0,
+        },
+        headers=manager_setup["headers"],
+    )
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["items"] == [
+        {
+            "product_id": manager_setup["product_id"],
+            "product_name": "Cake",
+            "quantity": 2,
+            "price": 10.0,
+            "is_bonus": False,
+            "is_return": False,
+        }
+    ]
+    assert Decimal(body["payment"]["total_amount"]) == 20
+    assert _product_quantity(db, manager_setup["product_id"]) == 8
+
+
+def test_create_shop_order_rejects_fractional_quantity(client, db, manager_setup):
+    response = client.post(
+        "/shop-orders",
+        json={
+            "shop_id": manager_setup["shop_id"],
+            "items": [{"product_id": manager_setup["product_id"], "quantity": "1.5"}],
+            "paid_amount": 0,
+        },
+        headers=manager_setup["headers"],
+    )
+
+    assert response.status_code == 400, response.text
+    assert response.json()["detail"] == "Количество должно быть целым числом"
+    assert _product_quantity(db, manager_setup["product_id"]) == 10